@@ -0,0 +1,334 @@
+#!/usr/bin/python3
+"""A local fake of the Twitch GQL and HLS servers, for benchmarking without a network.
+
+The data is generated from the requested names, so any size can be served:
+
+- A channel named `channelN` is live when N is a multiple of `LIVE_EVERY`.
+- A channel named `vodsN` has N videos, from the newest to the oldest.
+- A channel named `ghostN` doesn't exist.
+- Every video ID exists.
+
+It's used by `benchmarks/flows.py`. When it's run as a script, it runs cwitch with
+the Twitch servers redirected to a running fake:
+
+    python benchmarks/fake_twitch.py http://127.0.0.1:PORT -- s --channels-file FILE
+"""
+import json
+import re
+import sys
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+LIVE_EVERY = 10
+# A fixed time, so the listings are the same in every run.
+NEWEST_VIDEO_TIME = 1_700_000_000
+VIDEOS_INTERVAL = 24 * 60 * 60
+FIRST_VIDEO_ID = 1_000_000_000
+# The number of streams or videos that are picked in the prompts.
+PICKS_COUNT = 3
+
+# The name, resolution, frame rate and bitrate in bit/s of every HLS variant.
+VARIANTS = (
+    ("audio_only", None, None, 160_000),
+    ("160p30", "284x160", 30, 230_000),
+    ("360p30", "640x360", 30, 630_000),
+    ("480p30", "852x480", 30, 1_430_000),
+    ("720p60", "1280x720", 60, 3_420_000),
+    ("chunked", "1920x1080", 60, 6_500_000),
+)
+
+# These hosts are answered by the fake.
+REDIRECTED_HOSTS = ("https://gql.twitch.tv", "https://usher.ttvnw.net")
+
+
+def format_time(timestamp: int) -> str:
+    """Return a timestamp in the ISO 8601 format that Twitch uses."""
+    from datetime import datetime
+    from datetime import timezone
+
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime(
+        "%Y-%m-%dT%H:%M:%SZ"
+    )
+
+
+def is_live(login: str) -> bool:
+    """Return whether a fake channel is live."""
+    match = re.fullmatch(r"channel(\d+)", login.lower())
+    return match is not None and int(match.group(1)) % LIVE_EVERY == 0
+
+
+def exists(login: str) -> bool:
+    """Return whether a fake channel exists."""
+    return re.fullmatch(r"ghost\d*", login.lower()) is None
+
+
+def get_videos_count(login: str) -> int:
+    """Return the number of videos of a fake channel."""
+    match = re.fullmatch(r"vods(\d+)", login.lower())
+    return int(match.group(1)) if match else 0
+
+
+def make_video(login: str, index: int) -> dict:
+    """Return the GQL node of a channel's video, counting from the newest."""
+    video_id = str(FIRST_VIDEO_ID + index)
+    return {
+        "__typename": "Video",
+        "id": video_id,
+        "title": f"Video {index} of {login} with a fairly long title to render",
+        "lengthSeconds": 3600 + index % 7200,
+        "viewCount": 1000 + index,
+        "publishedAt": format_time(NEWEST_VIDEO_TIME - index * VIDEOS_INTERVAL),
+        "previewThumbnailURL": f"https://static-cdn.jtvnw.net/{video_id}-320x180.jpg",
+        "owner": {"login": login, "displayName": login.title()},
+        "game": {"displayName": "Just Chatting"},
+    }
+
+
+def make_stream(login: str) -> Optional[dict]:
+    """Return the GQL stream of a channel, or None when it's offline."""
+    if not is_live(login):
+        return None
+    return {
+        "id": str(zlib.crc32(login.encode())),
+        "title": f"Live with {login}",
+        "type": "live",
+        "viewersCount": len(login) * 100,
+        "createdAt": format_time(NEWEST_VIDEO_TIME),
+        "game": {"name": "Just Chatting"},
+        "previewImageURL": f"https://static-cdn.jtvnw.net/{login}-320x180.jpg",
+    }
+
+
+def answer_operation(operation: dict) -> dict:
+    """Return the response to one GQL operation."""
+    variables = operation.get("variables") or {}
+    name = operation.get("operationName")
+
+    if "query" in operation and "PlaybackAccessToken" in operation["query"]:
+        kind = "video" if "videoPlaybackAccessToken" in operation["query"] else "stream"
+        return {
+            "data": {f"{kind}PlaybackAccessToken": {"value": "{}", "signature": "fake"}}
+        }
+
+    if name == "LiveStatus":
+        # The batched status query of cwitch.
+        return {
+            "data": {
+                "users": [
+                    {"login": login, "displayName": login, "stream": make_stream(login)}
+                    if exists(login)
+                    else None
+                    for login in variables.get("logins", ())
+                ]
+            }
+        }
+
+    if name == "FilterableVideoTower_Videos":
+        login = variables["channelOwnerLogin"]
+        start = int(variables.get("cursor") or 0)
+        count = get_videos_count(login)
+        end = min(start + variables.get("limit", 100), count)
+        return {
+            "data": {
+                "user": {
+                    "id": login,
+                    "videos": {
+                        "edges": [
+                            {
+                                "__typename": "VideoEdge",
+                                # Only the last video has no next page.
+                                "cursor": str(i + 1) if i + 1 < count else None,
+                                "node": make_video(login, i),
+                            }
+                            for i in range(start, end)
+                        ]
+                    },
+                }
+            }
+        }
+
+    if name == "VideoMetadata":
+        index = int(variables["videoID"]) - FIRST_VIDEO_ID
+        return {"data": {"video": make_video("vods", index)}}
+
+    if name in ("StreamMetadata", "VideoPreviewOverlay"):
+        login = variables.get("channelLogin") or variables["login"]
+        if not exists(login):
+            return {"data": {"user": None}}
+        return {"data": {"user": {"id": login, "stream": make_stream(login)}}}
+
+    if name == "ComscoreStreamingQuery":
+        login = variables["channel"]
+        return {
+            "data": {
+                "user": {
+                    "displayName": login.title(),
+                    "broadcastSettings": {"title": f"Live with {login}"},
+                }
+            }
+        }
+
+    # The chapters and seekbar previews aren't used.
+    return {"data": {"video": None}}
+
+
+def make_master_playlist(base_url: str, name: str) -> str:
+    """Return an HLS master playlist with all the variants."""
+    lines = ["#EXTM3U"]
+    for variant, resolution, frame_rate, bitrate in VARIANTS:
+        lines.append(
+            f'#EXT-X-MEDIA:TYPE=VIDEO,GROUP-ID="{variant}",NAME="{variant}",'
+            + "AUTOSELECT=YES,DEFAULT=YES"
+        )
+        attributes = f'BANDWIDTH={bitrate},VIDEO="{variant}"'
+        if resolution:
+            attributes += f",RESOLUTION={resolution},FRAME-RATE={frame_rate}.000"
+            attributes += ',CODECS="avc1.64002A,mp4a.40.2"'
+        else:
+            attributes += ',CODECS="mp4a.40.2"'
+        lines.append(f"#EXT-X-STREAM-INF:{attributes}")
+        lines.append(f"{base_url}/media/{name}/{variant}/index.m3u8")
+    return "\n".join(lines) + "\n"
+
+
+class FakeTwitchHandler(BaseHTTPRequestHandler):
+    """Answer the GQL and HLS requests."""
+
+    protocol_version = "HTTP/1.1"
+
+    def send_body(self, body: bytes, content_type: str) -> None:
+        """Send a successful response."""
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Answer a GQL request with one or more operations."""
+        operations = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+        response: Any
+        if isinstance(operations, list):
+            response = [answer_operation(operation) for operation in operations]
+        else:
+            response = answer_operation(operations)
+
+        self.send_body(json.dumps(response).encode(), "application/json")
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Answer an HLS playlist or segment request."""
+        path = self.path.split("?")[0]
+        base_url = f"http://{self.headers['Host']}"
+
+        if path.endswith("index.m3u8"):
+            playlist = "#EXTM3U\n#EXT-X-TARGETDURATION:2\n"
+            playlist += "".join(f"#EXTINF:2.000,\n{i}.ts\n" for i in range(5))
+            self.send_body(playlist.encode(), "application/vnd.apple.mpegurl")
+        elif path.endswith(".m3u8"):
+            name = path.rsplit("/", 1)[-1][: -len(".m3u8")]
+            self.send_body(
+                make_master_playlist(base_url, name).encode(),
+                "application/vnd.apple.mpegurl",
+            )
+        elif path.endswith(".ts"):
+            self.send_body(bytes(188 * 1024), "video/mp2t")
+        else:
+            self.send_error(404)
+
+    def log_message(self, *args) -> None:
+        """Don't log every request."""
+
+
+def start_server() -> ThreadingHTTPServer:
+    """Serve the fake on a free local port in a daemon thread."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeTwitchHandler)
+    server.daemon_threads = True
+
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    return server
+
+
+def redirect_yt_dlp(fake_url: str) -> None:
+    """Send the requests of yt-dlp for the Twitch servers to the fake."""
+    from yt_dlp import YoutubeDL
+
+    original_urlopen = YoutubeDL.urlopen
+
+    def redirect(url: str) -> str:
+        for host in REDIRECTED_HOSTS:
+            if url.startswith(host):
+                return fake_url + url.replace(host, "", 1)
+        return url
+
+    def urlopen(self: YoutubeDL, request: Any) -> Any:
+        if isinstance(request, str):
+            request = redirect(request)
+        elif hasattr(request, "full_url"):
+            # Older yt-dlp versions use urllib requests.
+            request.full_url = redirect(request.full_url)
+        else:
+            request.url = redirect(request.url)
+        return original_urlopen(self, request)
+
+    YoutubeDL.urlopen = urlopen
+
+
+def replace_interaction() -> None:
+    """Pick the first medias and print them instead of playing them.
+
+    The prompts and the player are replaced, so the flows run without a user and
+    nothing is opened.
+    """
+    from cwitch import cli
+    from cwitch import prompts
+
+    def play_media(args: Any, medias_data: tuple, player_starter: Any = None) -> None:
+        for media in medias_data:
+            cli.get_playlist_item(args, media)
+
+    cli.start_player = lambda args: None
+    cli.play_media = play_media
+
+    prompts.formats_prompt = lambda media_formats: len(media_formats) - 1
+    prompts.pick_streams_prompt = lambda streams_titles: tuple(
+        range(1, min(PICKS_COUNT, len(streams_titles)) + 1)
+    )
+    prompts.pick_videos_prompt = lambda video_titles, allow_extra=True: (
+        tuple(map(int, list(video_titles)[:PICKS_COUNT])),
+        False,
+        None,
+    )
+
+
+def main() -> int:
+    """Run cwitch with the Twitch servers redirected to a running fake."""
+    fake_url, separator, *arguments = sys.argv[1:]
+    if separator != "--":
+        print(__doc__)
+        return 2
+
+    sys.path.insert(0, str(ROOT))
+    redirect_yt_dlp(fake_url)
+    replace_interaction()
+
+    from cwitch import cli
+
+    sys.argv = ["cwitch", *arguments]
+    cli.main()
+    # An error raises an exception, so it exits with a non-zero status.
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,227 @@
+#!/usr/bin/python3
+"""Measure the c, s and v flows against a local fake of Twitch, without a network.
+
+Every flow runs in its own process with a pseudo-terminal, so the rendering is
+measured too, and the prompts pick the first medias. It reports the wall time, the
+CPU time and the peak memory of every flow at every scale:
+
+    python benchmarks/flows.py
+    python benchmarks/flows.py --channels 10 100 1000 --vods 1000 5000 --videos 20
+"""
+import argparse
+import fcntl
+import os
+import pty
+import struct
+import subprocess
+import sys
+import tempfile
+import termios
+import threading
+import time
+from pathlib import Path
+from typing import List
+from typing import NamedTuple
+
+import fake_twitch
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class Result(NamedTuple):
+    """The resources that a flow used."""
+
+    wall_time: float
+    cpu_time: float
+    peak_rss: int
+    status: int
+    output: str
+
+
+def run_flow(fake_url: str, arguments: List[str], home: Path) -> Result:
+    """Run cwitch with the fake in a pseudo-terminal, and measure it."""
+    master, slave = pty.openpty()
+    # A terminal of 40 lines and 120 columns.
+    fcntl.ioctl(slave, termios.TIOCSWINSZ, struct.pack("HHHH", 40, 120, 0, 0))
+
+    environment = dict(
+        os.environ,
+        XDG_CONFIG_HOME=str(home / "config"),
+        XDG_CACHE_HOME=str(home / "cache"),
+        XDG_RUNTIME_DIR=str(home / "runtime"),
+        TERM="xterm-256color",
+        # The long listings aren't paged, so nothing waits for the keyboard.
+        PAGER="cat",
+    )
+
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, str(Path(__file__).parent / "fake_twitch.py"), fake_url, "--"]
+        + arguments,
+        cwd=ROOT,
+        env=environment,
+        stdin=slave,
+        stdout=slave,
+        stderr=slave,
+        start_new_session=True,
+    )
+    os.close(slave)
+
+    # The terminal must be read, or the process blocks when its buffer is full.
+    output = bytearray()
+
+    def read_output() -> None:
+        while True:
+            try:
+                data = os.read(master, 65536)
+            except OSError:
+                break
+            if not data:
+                break
+            output.extend(data)
+            del output[:-8192]
+
+    reader = threading.Thread(target=read_output)
+    reader.daemon = True
+    reader.start()
+
+    _pid, wait_status, usage = os.wait4(process.pid, 0)
+    wall_time = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(wait_status)
+
+    reader.join(1)
+    os.close(master)
+
+    return Result(
+        wall_time,
+        usage.ru_utime + usage.ru_stime,
+        # It's in KiB on Linux.
+        usage.ru_maxrss * 1024,
+        process.returncode,
+        output.decode(errors="replace"),
+    )
+
+
+def get_flows(args: argparse.Namespace, home: Path, fake_url: str) -> List[tuple]:
+    """Return the name, scale and cwitch arguments of every flow."""
+    flows = []
+    for backend in ("gql", "yt-dlp"):
+        (home / f"{backend}.ini").write_text(
+            f"[following_channels]\nstatus_backend={backend}\n"
+            + f"gql_url={fake_url}/gql\n"
+        )
+
+    for channels_count in args.channels:
+        channels_file = home / f"channels{channels_count}.ini"
+        channels_file.write_text(
+            "".join(
+                f"[Channel {i}]\nid=channel{i:04d}\n" for i in range(channels_count)
+            )
+        )
+
+        for backend in ("gql", "yt-dlp"):
+            flows.append(
+                (
+                    f"s ({backend})",
+                    f"{channels_count} channels",
+                    ["--config-file", str(home / f"{backend}.ini"), "s", "-q"]
+                    + ["--channels-file", str(channels_file)],
+                )
+            )
+
+    for videos_count in args.vods:
+        flows.append(
+            (
+                "c -l",
+                f"{videos_count} videos",
+                ["--config-file", str(home / "gql.ini"), "c", f"vods{videos_count}"]
+                + ["-l", "-n", str(videos_count), "-q"],
+            )
+        )
+
+    for videos_count in args.videos:
+        flows.append(
+            (
+                "v",
+                f"{videos_count} videos",
+                [
+                    "v",
+                    *(str(fake_twitch.FIRST_VIDEO_ID + i) for i in range(videos_count)),
+                    "-q",
+                ],
+            )
+        )
+
+    return flows
+
+
+def main() -> int:
+    """Run every flow at every scale and print a table of the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--runs", type=int, default=3, help="runs per flow.")
+    parser.add_argument(
+        "--channels",
+        type=int,
+        nargs="*",
+        default=[10, 100, 1000],
+        help="the follow list sizes for s.",
+    )
+    parser.add_argument(
+        "--vods",
+        type=int,
+        nargs="*",
+        default=[1000, 5000],
+        help="the catalogue sizes for c -l, all of them are listed.",
+    )
+    parser.add_argument(
+        "--videos",
+        type=int,
+        nargs="*",
+        default=[1, 20],
+        help="the number of videos for v.",
+    )
+    parser.add_argument(
+        "--cached",
+        action="store_true",
+        help="measure with the metadata cache filled by a first run.",
+    )
+    args = parser.parse_args()
+
+    server = fake_twitch.start_server()
+    fake_url = f"http://127.0.0.1:{server.server_port}"
+
+    print(f"{'flow':<12} {'scale':<16} {'wall':>9} {'cpu':>9} {'peak rss':>10}  status")
+
+    failed = False
+    with tempfile.TemporaryDirectory(prefix="cwitch-benchmark-") as directory:
+        home = Path(directory)
+
+        for name, scale, arguments in get_flows(args, home, fake_url):
+            if args.cached:
+                run_flow(fake_url, arguments, home)
+            else:
+                arguments = ["--no-cache", *arguments]
+
+            # The run with the shortest wall time is shown.
+            result = min(
+                (run_flow(fake_url, arguments, home) for _ in range(args.runs)),
+                key=lambda result: result.wall_time,
+            )
+
+            status = "ok" if result.status == 0 else f"FAILED ({result.status})"
+            failed = failed or result.status != 0
+            print(
+                f"{name:<12} {scale:<16} {result.wall_time:8.3f}s "
+                + f"{result.cpu_time:8.3f}s {result.peak_rss / 1024 / 1024:7.1f} MiB"
+                + f"  {status}",
+                flush=True,
+            )
+            if result.status != 0:
+                print(result.output[-2000:])
+
+    server.shutdown()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
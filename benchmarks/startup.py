@@ -0,0 +1,97 @@
+#!/usr/bin/python3
+"""Check that cwitch starts within its time budget on the non-interactive paths.
+
+It exits with a non-zero status when a path is over its budget, or when it imports
+a heavy dependency that it doesn't need, so it can be used as a regression check:
+
+    python benchmarks/startup.py
+"""
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List
+from typing import Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# The time in milliseconds that a path may add to a bare interpreter's startup.
+BUDGETS: Tuple[Tuple[Tuple[str, ...], float], ...] = (
+    (("-V",), 50),
+    (("--help",), 60),
+    (("c", "--help"), 60),
+    (("s", "--help"), 60),
+    (("v", "--help"), 60),
+    (("--complete-channel-id", "c"), 60),
+)
+HEAVY_MODULES = ("prompt_toolkit", "yt_dlp", "mpv")
+
+
+def measure(command: List[str], runs: int) -> float:
+    """Return the best wall time of a command in milliseconds."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def imported_heavy_modules(arguments: Tuple[str, ...]) -> List[str]:
+    """Return the heavy modules that are imported by a path."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "cwitch", *arguments],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    return sorted(
+        {
+            module
+            for line in result.stderr.splitlines()
+            for module in HEAVY_MODULES
+            if line.rsplit("|", 1)[-1].strip().split(".")[0] == module
+        }
+    )
+
+
+def main() -> int:
+    """Measure every path and compare it with its budget."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--runs", type=int, default=10, help="runs per path.")
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="multiply the budgets, for slow machines.",
+    )
+    args = parser.parse_args()
+
+    baseline = measure([sys.executable, "-c", "pass"], args.runs)
+    print(f"{'bare interpreter':<24} {baseline:7.1f} ms")
+
+    failed = False
+    for arguments, budget in BUDGETS:
+        elapsed = measure([sys.executable, "-m", "cwitch", *arguments], args.runs)
+        overhead = elapsed - baseline
+        heavy_modules = imported_heavy_modules(arguments)
+
+        status = "ok"
+        if overhead > budget * args.scale:
+            status = f"OVER BUDGET ({budget * args.scale:.0f} ms)"
+        if heavy_modules:
+            status = f"IMPORTS {', '.join(heavy_modules)}"
+        failed = failed or status != "ok"
+
+        print(
+            f"{' '.join(arguments):<24} {elapsed:7.1f} ms (+{overhead:.1f} ms) {status}"
+        )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
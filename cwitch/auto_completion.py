@@ -1,36 +1,110 @@
 """Auto completion classes for prompt-toolkit prompts."""
+import math
+from collections import Counter
+from itertools import islice
+from typing import Dict
 from typing import Generator
+from typing import Iterable
+from typing import List
+from typing import Set
 
 from prompt_toolkit import HTML
 from prompt_toolkit.completion import CompleteEvent
 from prompt_toolkit.completion import Completer
 from prompt_toolkit.completion import Completion
 from prompt_toolkit.document import Document
+from prompt_toolkit.formatted_text import FormattedText
+
+# The completions menu can't show more than them anyway.
+MAX_COMPLETIONS = 100
+# The fraction of a text's trigrams that a title must have to match it.
+MIN_TRIGRAMS_RATIO = 0.6
+
+
+def get_trigrams(text: str) -> Set[str]:
+    """Return all the sequences of three characters in a text."""
+    return {"".join(trigram) for trigram in zip(text, text[1:], text[2:])}
 
 
 class MediaTitlesCompleter(Completer):
-    """Auto completion for media prompt when picking from a streams/videos list."""
+    """Auto completion for media prompt when picking from a streams/videos list.
 
-    def __init__(self, media_titles: dict) -> None:
-        """Take some data about the list."""
+    A number completes the items' numbers, and a text completes the numbers of the
+    items with the most similar titles. The titles are indexed by their trigrams
+    once, so only the items that share a trigram with the text are ranked.
+    """
+
+    def __init__(self, media_titles: dict, allow_extra: bool = True) -> None:
+        """Take some data about the list, and whether extra items can be asked."""
         self.media_titles = media_titles
+        self.allow_extra = allow_extra
+        self.lowered_titles = {i: title.lower() for i, title in media_titles.items()}
+        # The items of every trigram, with the words' edges as spaces.
+        self.trigrams_index: Dict[str, Set[str]] = {}
+        for i, title in self.lowered_titles.items():
+            for trigram in get_trigrams(f" {title} "):
+                self.trigrams_index.setdefault(trigram, set()).add(i)
+        self.positions = {i: position for position, i in enumerate(media_titles)}
+
+    def search_titles(self, text: str) -> List[str]:
+        """Return the items whose titles are similar to a text, the most similar first."""
+        text = text.lower()
+        # A text usually starts at a word's start.
+        trigrams = get_trigrams(f" {text}")
+        if not trigrams:
+            # Too short to have a trigram.
+            return [i for i, title in self.lowered_titles.items() if text in title]
+
+        matches_counts: Counter = Counter()
+        for trigram in trigrams:
+            matches_counts.update(self.trigrams_index.get(trigram, ()))
+
+        # Allow a typo or two in the text, but not unrelated titles.
+        min_matches = max(1, math.ceil(len(trigrams) * MIN_TRIGRAMS_RATIO))
+        return sorted(
+            (i for i, count in matches_counts.items() if count >= min_matches),
+            key=lambda i: (
+                -matches_counts[i],
+                text not in self.lowered_titles[i],
+                self.positions[i],
+            ),
+        )
 
     def get_completions(
         self, document: Document, complete_event: CompleteEvent
     ) -> Generator:
-        """Yield a completion for every item."""
-        for i, title in self.media_titles.items():
-            if i not in document.text.split():
-                # If the value was already picked no need to show it in the tap completion.
-                yield Completion(
-                    i, display=HTML(f"<b>[{i}]</b> {title}"), start_position=0
-                )
-
-        yield Completion(
-            "x",
-            display=HTML("<b>x[n]</b> Extra videos (e.g. 'x2' or 'x13')."),
-            start_position=0,
-        )
+        """Yield a completion for every matching item that isn't picked yet."""
+        word = document.get_word_before_cursor(WORD=True)
+        # If the value was already picked no need to show it in the tap completion.
+        picked = set(document.text.split()) - {word}
+
+        if not word or word.isdigit():
+            matches: Iterable[str] = (
+                i for i in self.media_titles if i.startswith(word)
+            )
+        elif self.allow_extra and word[0] == "x" and word[1:].isdigit():
+            matches = ()
+        else:
+            matches = self.search_titles(word)
+
+        for i in islice((i for i in matches if i not in picked), MAX_COMPLETIONS):
+            yield Completion(
+                i,
+                # It's not parsed as HTML, since it's created on every key press.
+                display=FormattedText(
+                    [("class:b", f"[{i}]"), ("", f" {self.media_titles[i]}")]
+                ),
+                start_position=-len(word),
+            )
+
+        if self.allow_extra and (
+            not word or (word[0] == "x" and (word[1:].isdigit() or not word[1:]))
+        ):
+            yield Completion(
+                word or "x",
+                display=HTML("<b>x[n]</b> Extra videos (e.g. 'x2' or 'x13')."),
+                start_position=-len(word),
+            )
 
 
 class MediaFormatCompleter(Completer):
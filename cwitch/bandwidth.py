@@ -0,0 +1,128 @@
+"""Pick the best format that the network can play without rebuffering."""
+import time
+from pathlib import Path
+from typing import Dict
+from typing import Optional
+from typing import Sequence
+from urllib.parse import urljoin
+from urllib.parse import urlparse
+from urllib.request import Request
+from urllib.request import urlopen
+
+from . import __about__ as about
+from .cache import read_json
+from .cache import write_json
+from .cache import xdg_cache_home
+from .media import MediaFormat
+
+MEASUREMENTS_FILE = Path.joinpath(xdg_cache_home, about.APP_NAME, "bandwidth.json")
+
+# A probe stops at whichever limit it reaches first.
+PROBE_SECONDS = 2.0
+PROBE_SIZE = 4 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+
+def get_probe_url(url: str, headers: Dict[str, str], timeout: float) -> str:
+    """Return the first media segment's URL of an HLS playlist, or the URL itself."""
+    # A master playlist leads to a media playlist, that leads to a segment.
+    for _ in range(2):
+        with urlopen(Request(url, headers=headers), timeout=timeout) as response:
+            head = response.read(len(b"#EXTM3U"))
+            if head != b"#EXTM3U":
+                return url
+            playlist = (head + response.read()).decode(errors="replace")
+
+        uris = [
+            line.strip()
+            for line in playlist.splitlines()
+            if line.strip() and not line.startswith("#")
+        ]
+        if not uris:
+            raise ValueError("The playlist has no segments.")
+        url = urljoin(url, uris[0])
+
+    return url
+
+
+def measure_throughput(
+    url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 10.0
+) -> float:
+    """Download from a media URL for a short time, and return the bits per second."""
+    headers = headers or {}
+    probe_url = get_probe_url(url, headers, timeout)
+
+    with urlopen(Request(probe_url, headers=headers), timeout=timeout) as response:
+        # The time to connect isn't counted, only the transfer is.
+        start = time.perf_counter()
+        size = 0
+        while size < PROBE_SIZE and time.perf_counter() - start < PROBE_SECONDS:
+            chunk = response.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+        elapsed = time.perf_counter() - start
+
+    if not size:
+        raise ValueError("The probe didn't download anything.")
+
+    return size * 8 / max(elapsed, 1e-3)
+
+
+def get_throughput(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    ttl: float = 300,
+    measurements_file: Path = MEASUREMENTS_FILE,
+) -> float:
+    """Return the throughput to a URL's host, measuring it if it's not measured recently."""
+    host = urlparse(url).netloc
+
+    measurements = read_json(measurements_file) or {}
+
+    # Keep only the recent measurements.
+    now = time.time()
+    measurements = {
+        h: m
+        for h, m in measurements.items()
+        if isinstance(m, list) and len(m) == 2 and now - m[0] <= ttl
+    }
+    if host in measurements:
+        return measurements[host][1]
+
+    throughput = measure_throughput(url, headers)
+    measurements[host] = [time.time(), throughput]
+    write_json(measurements_file, measurements)
+
+    return throughput
+
+
+def pick_format(
+    formats: Sequence[MediaFormat],
+    http_headers: Optional[Dict[str, str]] = None,
+    safety_margin: float = 0.75,
+    ttl: float = 300,
+) -> int:
+    """Return the index of the highest bitrate format that fits in the throughput.
+
+    Only a fraction of the measured throughput is used, so the bitrate's variations
+    don't cause rebuffering. When no format fits, the lowest bitrate one is picked.
+    """
+    video_formats = [
+        (f.tbr, i) for i, f in enumerate(formats) if f.tbr and f.vcodec != "none"
+    ]
+    if not video_formats:
+        # Without bitrates there is nothing to compare, so play the best one.
+        return len(formats) - 1
+
+    best_format = formats[max(video_formats)[1]]
+    try:
+        throughput = get_throughput(best_format.url, http_headers, ttl)
+    except (OSError, ValueError):
+        return min(video_formats)[1]
+
+    # The bitrates are in kbit/s.
+    fitting_formats = [
+        (tbr, i) for tbr, i in video_formats if tbr * 1000 <= throughput * safety_margin
+    ]
+    return max(fitting_formats or [min(video_formats)])[1]
@@ -0,0 +1,206 @@
+"""An on-disk cache for the extracted videos and channels metadata."""
+import fcntl
+import json
+import os
+import threading
+import time
+from os import environ
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+from . import __about__ as about
+
+
+if environ.get("XDG_CACHE_HOME"):
+    # The (or "") is to pass the type check.
+    xdg_cache_home = Path(environ.get("XDG_CACHE_HOME") or "")
+else:
+    xdg_cache_home = Path.joinpath(Path.home(), ".cache")
+
+if environ.get("XDG_RUNTIME_DIR"):
+    # The (or "") is to pass the type check.
+    xdg_runtime_dir = Path(environ.get("XDG_RUNTIME_DIR") or "")
+else:
+    xdg_runtime_dir = xdg_cache_home
+
+CACHE_DIR = Path.joinpath(xdg_cache_home, about.APP_NAME, "metadata")
+STATUS_FILE = Path.joinpath(xdg_cache_home, about.APP_NAME, "status.json")
+
+# Different channels lists might be checked, so the snapshot is bounded by itself.
+MAX_STATUS_CHANNELS = 2000
+MAX_STATUS_TITLE_LENGTH = 140
+
+
+def write_json(path: Path, data: Any) -> bool:
+    """Write a JSON file atomically, and return whether it is written.
+
+    Other cwitch instances never see a partially written file.
+    """
+    temp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp_path, "w") as json_file:
+            json.dump(data, json_file, separators=(",", ":"))
+        os.replace(temp_path, path)
+    except (OSError, TypeError, ValueError):
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
+        return False
+
+    return True
+
+
+def read_json(path: Path, data_type: type = dict) -> Optional[Any]:
+    """Return the data of a JSON file, or None when it can't be read.
+
+    A file whose data isn't of the given type is treated as unreadable.
+    """
+    try:
+        with open(path, "r") as json_file:
+            data = json.load(json_file)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(data, data_type):
+        return None
+    return data
+
+
+def read_status_snapshot(path: Path = STATUS_FILE) -> Dict[str, list]:
+    """Return the last known status of every channel.
+
+    Every channel has a [checked time, is live, title, viewers count] list.
+    """
+    return read_json(path) or {}
+
+
+def write_status_snapshot(statuses: Dict[str, list], path: Path = STATUS_FILE) -> None:
+    """Merge channels status into the snapshot, keeping the most recent ones.
+
+    Concurrent runs take a lock on a sidecar file, so they don't drop each other's
+    channels, and every channel keeps the newest status.
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(path.with_suffix(".lock"), "w")
+    except OSError:
+        return
+
+    with lock_file:
+        # The lock is released when the file is closed.
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        snapshot = read_status_snapshot(path)
+
+        for login, (checked, is_live, title, viewers) in statuses.items():
+            if login not in snapshot or snapshot[login][0] <= checked:
+                snapshot[login] = [
+                    checked,
+                    is_live,
+                    title[:MAX_STATUS_TITLE_LENGTH] if title else None,
+                    viewers,
+                ]
+
+        if len(snapshot) > MAX_STATUS_CHANNELS:
+            snapshot = dict(
+                sorted(snapshot.items(), key=lambda item: item[1][0], reverse=True)[
+                    :MAX_STATUS_CHANNELS
+                ]
+            )
+
+        write_json(path, snapshot)
+
+
+class MetadataCache(object):
+    """Keep JSON entries in files with a time to live and a total size limit.
+
+    When the size limit is exceeded, the least recently used entries are removed.
+    A file modification time is updated when it is read to track its last use.
+    """
+
+    def __init__(
+        self,
+        directory: Path = CACHE_DIR,
+        max_size: int = 50 * 1024 * 1024,
+        video_ttl: float = 6 * 60 * 60,
+        listing_ttl: float = 5 * 60,
+        refresh: bool = False,
+    ) -> None:
+        """Take the cache location, limits and whether to ignore existing entries."""
+        self.directory = directory
+        self.max_size = max_size
+        self.video_ttl = video_ttl
+        self.listing_ttl = listing_ttl
+        self.refresh = refresh
+
+    def get_path(self, key: str) -> Path:
+        """Return the file path of an entry."""
+        # It's imported here, so the shell completion doesn't wait for it.
+        import hashlib
+
+        return Path.joinpath(
+            self.directory, hashlib.sha1(key.encode()).hexdigest() + ".json"
+        )
+
+    def read(self, key: str, ttl: float) -> Optional[Any]:
+        """Return an entry's data if it exists and it is not expired."""
+        if self.refresh:
+            return None
+
+        path = self.get_path(key)
+        try:
+            with open(path, "r") as entry_file:
+                entry = json.load(entry_file)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get("key") != key or time.time() - entry.get("time", 0) > ttl:
+            return None
+
+        try:
+            # Mark it as recently used.
+            os.utime(path)
+        except OSError:
+            pass
+
+        return entry.get("data")
+
+    def write(self, key: str, data: Any) -> None:
+        """Store an entry, then evict old entries if the cache is too large."""
+        if write_json(
+            self.get_path(key), {"key": key, "time": time.time(), "data": data}
+        ):
+            self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the size limit is met."""
+        entries = []
+        total_size = 0
+
+        try:
+            with os.scandir(self.directory) as directory:
+                for entry in directory:
+                    if entry.name.endswith(".json"):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+                        total_size += stat.st_size
+        except OSError:
+            return
+
+        for _mtime, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
+
+
+# It is disabled until the CLI enables it.
+metadata_cache: Optional[MetadataCache] = None
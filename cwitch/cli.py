@@ -1,15 +1,51 @@
-"""Command line interface for cwitch."""
-import argparse
+"""Command line interface for cwitch.
 
-from prompt_toolkit import HTML
-from prompt_toolkit import print_formatted_text
+Heavy dependencies are imported only where they are needed, to keep the startup
+fast for `-V`, `--help` and shell completions.
+"""
+import argparse
+import sys
+import threading
+import time
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import TYPE_CHECKING
+from typing import Union
 
 from . import __about__ as about
-from . import printers
-from . import prompts
+
+if TYPE_CHECKING:
+    from mpv import MPV
+
+    from .media import Media
 
 # from mpv import MPV
 
+# The timings of playing are shown relative to it.
+START_TIME = time.perf_counter()
+
+
+def add_output_format_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options to write the results as JSON, instead of asking to play them."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--json",
+        action="store_const",
+        const="json",
+        dest="output_format",
+        help="write the results as a JSON list, without prompting or playing.",
+    )
+    group.add_argument(
+        "--jsonl",
+        action="store_const",
+        const="jsonl",
+        dest="output_format",
+        help="write every result as a JSON line when it's ready, "
+        + "without prompting or playing.",
+    )
+
 
 def get_parser() -> argparse.ArgumentParser:
     """Return a parser object."""
@@ -28,6 +64,43 @@ def get_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--config-file", type=argparse.FileType("r"), help="an alternative config file."
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="don't read or write the cached videos and channels metadata.",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="ignore the cached metadata and fetch it again.",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="print how long every phase and extraction takes.",
+    )
+    parser.add_argument(
+        "--trace-file",
+        type=argparse.FileType("w"),
+        metavar="FILE",
+        help="write the timings as a Chrome trace to a file.",
+    )
+    # The shell completion scripts call it for the `c` subcommand's CHANNEL-ID.
+    parser.add_argument(
+        "--complete-channel-id", metavar="PREFIX", help=argparse.SUPPRESS
+    )
+    parser.add_argument(
+        "--reuse-player",
+        type=str,
+        nargs="?",
+        metavar="mode",
+        choices=["no", "append", "replace"],
+        const="append",
+        help="play in a running %(prog)s player, pick one of the folowing: "
+        + "%(choices)s (defaults to: append).",
+    )
+
+    parser.set_defaults(output_format=None)
 
     # Create a second layer parsers
     subparsers = parser.add_subparsers(
@@ -40,7 +113,6 @@ def get_parser() -> argparse.ArgumentParser:
     channel_parser = subparsers.add_parser(
         "c", help="to play a live stream or search in the previous videos of a channel."
     )
-    # TODO Tap auto completion for channel name from the channels list file.
     channel_parser.add_argument(
         "channel_id",
         type=str,
@@ -70,14 +142,22 @@ def get_parser() -> argparse.ArgumentParser:
         metavar="integer",
         help="Maximum number of listed videos",
     )
+    channel_parser.add_argument(
+        "-w",
+        "--max-workers",
+        type=int,
+        metavar="integer",
+        help="maximum number of picked videos to fetch at the same time.",
+    )
 
+    add_output_format_arguments(channel_parser)
     channel_parser.add_argument(
         "-q",
         "--quality",
         type=str,
         nargs="?",
         metavar="format",
-        choices=["audio", "best", "middle", "worst"],
+        choices=["audio", "best", "middle", "worst", "auto"],
         const="best",
         help="pick one of the folowing: %(choices)s (defaults to: best).",
     )
@@ -97,17 +177,91 @@ def get_parser() -> argparse.ArgumentParser:
         type=argparse.FileType("r"),
         help="an alternative channels list file.",
     )
+    following_channels_parser.add_argument(
+        "-w",
+        "--max-workers",
+        type=int,
+        metavar="integer",
+        help="maximum number of channels to check at the same time.",
+    )
+    following_channels_parser.add_argument(
+        "-t",
+        "--timeout",
+        type=float,
+        metavar="seconds",
+        help="give up on a channel that doesn't answer in time.",
+    )
+    following_channels_parser.add_argument(
+        "--cached",
+        action="store_true",
+        help="show the last known status at once, then only what changed.",
+    )
+    add_output_format_arguments(following_channels_parser)
     following_channels_parser.add_argument(
         "-q",
         "--quality",
         type=str,
         nargs="?",
         metavar="format",
-        choices=["audio", "best", "middle", "worst"],
+        choices=["audio", "best", "middle", "worst", "auto"],
         const="best",
         help="pick one of the folowing: %(choices)s (defaults to: best).",
     )
 
+    # The new videos command
+    new_videos_parser = subparsers.add_parser(
+        "new",
+        help="list the videos that the channels you follow published since the last time.",
+    )
+    new_videos_parser.add_argument(
+        "--channels-file",
+        type=argparse.FileType("r"),
+        help="an alternative channels list file.",
+    )
+    new_videos_parser.add_argument(
+        "-w",
+        "--max-workers",
+        type=int,
+        metavar="integer",
+        help="maximum number of picked videos to fetch at the same time.",
+    )
+    new_videos_parser.add_argument(
+        "-t",
+        "--timeout",
+        type=float,
+        metavar="seconds",
+        help="give up on checking for new videos if it doesn't answer in time.",
+    )
+    add_output_format_arguments(new_videos_parser)
+    new_videos_parser.add_argument(
+        "-q",
+        "--quality",
+        type=str,
+        nargs="?",
+        metavar="format",
+        choices=["audio", "best", "middle", "worst", "auto"],
+        const="best",
+        help="pick one of the folowing: %(choices)s (defaults to: best).",
+    )
+
+    # The daemon command
+    daemon_parser = subparsers.add_parser(
+        "daemon",
+        help="keep checking the channels that you follow, so `s` answers at once.",
+    )
+    daemon_parser.add_argument(
+        "--channels-file",
+        type=argparse.FileType("r"),
+        help="an alternative channels list file.",
+    )
+    daemon_parser.add_argument(
+        "-t",
+        "--timeout",
+        type=float,
+        metavar="seconds",
+        help="give up on a check that doesn't answer in time.",
+    )
+
     # The video command
     video_parser = subparsers.add_parser(
         "v", help="watch one or more video with the ID."
@@ -119,13 +273,20 @@ def get_parser() -> argparse.ArgumentParser:
         metavar="VIDEO-ID",
         help="one or more video ID. they will be opened as a playlist.",
     )
+    video_parser.add_argument(
+        "-w",
+        "--max-workers",
+        type=int,
+        metavar="integer",
+        help="maximum number of videos to fetch at the same time.",
+    )
     video_parser.add_argument(
         "-q",
         "--quality",
         type=str,
         nargs="?",
         metavar="format",
-        choices=["audio", "best", "middle", "worst"],
+        choices=["audio", "best", "middle", "worst", "auto"],
         const="best",
         help="pick one of the folowing: %(choices)s (defaults to: best).",
     )
@@ -133,16 +294,182 @@ def get_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def play_media(args: argparse.Namespace, medias_data: tuple) -> None:
-    """Play a list of videos or streams."""
-    from mpv import MPV, ShutdownError
+# Resolve the next lazy medias when the playback is this close to the playlist's end.
+RESOLVE_AHEAD = 2
+
+
+def get_playlist_item(
+    args: argparse.Namespace, media: Union["Media", Callable, None]
+) -> Optional[Tuple[str, str]]:
+    """Resolve a media if it is lazy, pick its format and return its url and title."""
+    from . import printers
+    from . import prompts
+    from . import timings
+
+    media_data = media() if callable(media) else media
+    if not media_data:
+        return None
+
+    with timings.span(media_data.title[:60], "rendering"):
+        printers.print_media_data(args, media_data)
+
+    media_formats = [m.format_id for m in media_data.formats]
+    if args.quality and len(media_formats) >= 2:
+        if args.quality == "audio":
+            media_format = 0
+        elif args.quality == "best":
+            media_format = -1
+        elif args.quality == "middle":
+            media_format = -2
+        elif args.quality == "worst":
+            media_format = 1
+        elif args.quality == "auto":
+            from . import bandwidth
+            from .config import get_config
+
+            config = get_config(args.config_file)
+            media_format = bandwidth.pick_format(
+                media_data.formats,
+                media_data.http_headers,
+                config["quality"]["safety_margin"],
+                config["quality"]["probe_ttl"],
+            )
+    else:
+        with timings.span("pick format", "prompt"):
+            media_format = prompts.formats_prompt(media_formats)
+
+    return media_data.formats[media_format].url, media_data.title
 
-    player = MPV(
-        input_default_bindings=True,
-        input_vo_keyboard=True,
-        osc=True,
-        title=about.APP_NAME,
-    )
+
+def append_lazy_medias(
+    args: argparse.Namespace, player: "MPV", medias: list, queued_count: int
+) -> None:
+    """Resolve the medias in order when the playback gets close to them, and queue them."""
+    from . import mpv_ipc
+
+    condition = threading.Condition()
+    position = 0
+
+    @player.property_observer("playlist-pos")
+    def update_position(_name: str, value: Optional[int]) -> None:
+        nonlocal position
+        with condition:
+            position = value or 0
+            condition.notify()
+
+    for media in medias:
+        with condition:
+            while queued_count - position > RESOLVE_AHEAD:
+                condition.wait()
+
+        item = get_playlist_item(args, media)
+        if item:
+            url, title = item
+            player.playlist_append(
+                mpv_ipc.get_titled_url(url, title), media_title=title
+            )
+            queued_count += 1
+
+
+class PlayerStarter(object):
+    """Create the player in a background thread, while the medias are extracted.
+
+    Loading libmpv and initializing the player overlap with the extractions and the
+    prompts, so the player is ready when the first media is.
+    """
+
+    def __init__(self, options: dict) -> None:
+        """Start creating the player with its options."""
+        self.options = options
+        self.player: Optional["MPV"] = None
+        self.error: Optional[Exception] = None
+        self.ready_time: Optional[float] = None
+        self.taken = False
+
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def run(self) -> None:
+        """Load libmpv and create the player."""
+        try:
+            from mpv import MPV
+
+            self.player = MPV(**self.options)
+        except Exception as error:
+            # It's raised when the player is taken.
+            self.error = error
+        self.ready_time = time.perf_counter()
+
+    def get(self) -> "MPV":
+        """Wait until the player is created, and take it."""
+        self.thread.join()
+        if self.error:
+            raise self.error
+
+        self.taken = True
+        return self.player
+
+    def close(self) -> None:
+        """Terminate the player if it's created, but nothing is played with it."""
+        if not self.taken and not self.thread.is_alive() and self.player is not None:
+            self.player.terminate()
+
+
+def get_reuse_mode(args: argparse.Namespace) -> str:
+    """Return how a running player is reused."""
+    from .config import get_config
+
+    return args.reuse_player or get_config(args.config_file)["player"]["reuse"]
+
+
+def get_player_options(args: argparse.Namespace) -> dict:
+    """Return the options of a new player."""
+    from . import mpv_ipc
+
+    player_options = {
+        "input_default_bindings": True,
+        "input_vo_keyboard": True,
+        "osc": True,
+        "title": about.APP_NAME,
+    }
+
+    if get_reuse_mode(args) != "no":
+        # Let the next runs find this player.
+        mpv_ipc.SOCKET_PATH.parent.mkdir(parents=True, exist_ok=True)
+        player_options["input_ipc_server"] = str(mpv_ipc.SOCKET_PATH)
+
+    return player_options
+
+
+def start_player(args: argparse.Namespace) -> Optional[PlayerStarter]:
+    """Start creating a player, unless a running player will be reused."""
+    from . import mpv_ipc
+
+    if get_reuse_mode(args) != "no" and mpv_ipc.send_commands([]):
+        return None
+
+    return PlayerStarter(get_player_options(args))
+
+
+def play_media(
+    args: argparse.Namespace,
+    medias_data: tuple,
+    player_starter: Optional[PlayerStarter] = None,
+) -> None:
+    """Play a list of videos or streams.
+
+    Lazy medias are functions that return a media. They are resolved when the player
+    gets close to them, so the playback starts with the first playable media.
+    Without a player starter, a running player that answered start_player is reused.
+    """
+    from prompt_toolkit import HTML, print_formatted_text
+
+    from . import mpv_ipc
+    from . import timings
+
+    reuse = get_reuse_mode(args)
+    use_running_player = reuse != "no" and player_starter is None
 
     # script_dir = str(Path.home())+'/.config/mpv/scripts/'
     # [self.player.command('load-script', script_dir+script) for script in os.listdir(script_dir)]
@@ -151,37 +478,62 @@ def play_media(args: argparse.Namespace, medias_data: tuple) -> None:
     # def time_observer(_name, value):
     #     ...
 
-    for media in medias_data:
-        if media is None:
-            continue
-
-        printers.print_media_data(args, media)
-
-        media_formats = [m["format_id"] for m in media["formats"]]
-        if args.quality and len(media_formats) >= 2:
-            if args.quality == "audio":
-                media_format = 0
-            elif args.quality == "best":
-                media_format = -1
-            elif args.quality == "middle":
-                media_format = -2
-            elif args.quality == "worst":
-                media_format = 1
-        else:
-            media_format = prompts.formats_prompt(media_formats)
+    playlist: List[Tuple[str, str]] = []
+    lazy_medias = list(medias_data)
+    # The position of a running player isn't observed, so it gets all of them.
+    while lazy_medias and (
+        not playlist or use_running_player or not callable(lazy_medias[0])
+    ):
+        item = get_playlist_item(args, lazy_medias.pop(0))
+        if item:
+            playlist.append(item)
 
-        player.playlist_append(
-            # Since mpv discards what is beyond the #, we can use it as a title in the playlist
-            media["formats"][media_format]["url"] + "#" + media["title"],
-            media_title=media["title"],
-        )
+    if not playlist:
+        return
+
+    if use_running_player and mpv_ipc.load_playlist(
+        playlist, replace=reuse == "replace"
+    ):
+        # The running player plays them, so there is nothing to wait for.
+        return
+
+    medias_ready_time = time.perf_counter()
+
+    # Loading libmpv is skipped when a running player is reused.
+    player_starter = player_starter or PlayerStarter(get_player_options(args))
+    with timings.span("wait for the player", "player"):
+        player = player_starter.get()
+
+    from mpv import ShutdownError
+
+    for url, title in playlist:
+        player.playlist_append(mpv_ipc.get_titled_url(url, title), media_title=title)
 
     player.playlist_pos = 0
     player.loop_playlist = "inf"
 
-    player.wait_until_playing()
+    if lazy_medias:
+        resolver = threading.Thread(
+            target=append_lazy_medias, args=(args, player, lazy_medias, len(playlist))
+        )
+        resolver.daemon = True
+        resolver.start()
+
+    with timings.span("wait for playing", "player"):
+        player.wait_until_playing()
+    playing_time = time.perf_counter()
     if args.verbosity:
         print_formatted_text(HTML("<orange>#</orange>"), player.playlist)
+        print_formatted_text(
+            HTML(
+                "<orange>#</orange> Player ready after {:.2f}s, medias ready after "
+                + "{:.2f}s, playing after {:.2f}s."
+            ).format(
+                (player_starter.ready_time or 0) - START_TIME,
+                medias_ready_time - START_TIME,
+                playing_time - START_TIME,
+            )
+        )
 
     try:
         while True:
@@ -195,8 +547,18 @@ def main() -> int:
     parser = get_parser()
     args = parser.parse_args()
 
+    if args.complete_channel_id is not None:
+        # It must answer fast, so nothing else is done.
+        from . import shell_completion
+
+        print(*shell_completion.complete_channel_id(args.complete_channel_id), sep="\n")
+        return 0
+
     if args.verbosity:
-        print_formatted_text(HTML("<orange>#</orange>"), args)
+        from prompt_toolkit import HTML, print_formatted_text
+
+        # Keep the standard output for the JSON output.
+        print_formatted_text(HTML("<orange>#</orange>"), args, file=sys.stderr)
 
     if args.version:
         print(f"{about.APP_NAME} {about.VERSION}")
@@ -205,36 +567,78 @@ def main() -> int:
         parser.print_help()
         return 0
 
-    from . import subcommands
+    if not args.no_cache:
+        from . import cache
+        from .config import get_config
+
+        config = get_config(args.config_file)
+        cache.metadata_cache = cache.MetadataCache(
+            max_size=config["cache"]["max_size"] * 1024 * 1024,
+            video_ttl=config["cache"]["video_ttl"],
+            listing_ttl=config["cache"]["listing_ttl"],
+            refresh=args.refresh,
+        )
 
-    if args.subcommand == "c":
-        (
-            media_data,
-            displayed_videos_count,
-            extra_count,
-        ) = subcommands.channels_command(args)
-        if displayed_videos_count:
-            while displayed_videos_count:
+    from . import timings
+
+    if args.timings or args.trace_file:
+        recorder = timings.recorder = timings.Timings()
+        recorder.start_time = START_TIME
+
+    player_starter = None
+    try:
+        if args.output_format:
+            # It doesn't need the prompts, the printers or the player.
+            from . import json_output
+
+            return json_output.write_records(args)
+
+        with timings.span("import the subcommands", "startup"):
+            from . import subcommands
+
+        if args.subcommand in ("c", "s", "v", "new"):
+            # The player is created while the medias are extracted and picked.
+            player_starter = start_player(args)
+
+        if args.subcommand == "c":
+            (
+                media_data,
+                videos_session,
+                extra_count,
+            ) = subcommands.channels_command(args)
+            while videos_session:
                 (
                     sub_media_data,
-                    displayed_videos_count,
+                    videos_session,
                     extra_count,
-                ) = subcommands.channels_command(
-                    args, displayed_videos_count, extra_count
-                )
+                ) = subcommands.channels_command(args, videos_session, extra_count)
                 if media_data:
                     media_data.extend(sub_media_data or [])
                 else:
                     media_data = sub_media_data
-        elif displayed_videos_count == 0:
-            print_formatted_text(HTML("<red>Error</red>: There is no more videos."))
-    elif args.subcommand == "s":
-        media_data = subcommands.following_channels_command(args)
-    elif args.subcommand == "v":
-        media_data = subcommands.videos_command(args)
-
-    if media_data:
-        play_media(args, tuple(media_data))
+        elif args.subcommand == "s":
+            media_data = subcommands.following_channels_command(args)
+        elif args.subcommand == "v":
+            media_data = subcommands.videos_command(args)
+        elif args.subcommand == "new":
+            media_data = subcommands.new_videos_command(args)
+        elif args.subcommand == "daemon":
+            return subcommands.daemon_command(args)
+
+        if media_data:
+            play_media(args, tuple(media_data), player_starter)
+    except KeyboardInterrupt:
+        # The running extractions are cancelled by their engine.
+        return 130
+    finally:
+        if player_starter:
+            player_starter.close()
+
+        if args.timings:
+            recorder.print_summary()
+        if args.trace_file:
+            recorder.write_trace(args.trace_file)
+            args.trace_file.close()
     return 1
 
 
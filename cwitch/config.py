@@ -1,7 +1,9 @@
 """Parse the config and the channels list."""
+from argparse import Namespace
 from configparser import ConfigParser
 from configparser import NoOptionError
 from configparser import NoSectionError
+from functools import lru_cache
 from os import environ
 from pathlib import Path
 from typing import Optional
@@ -16,7 +18,11 @@ if environ.get("XDG_CONFIG_HOME"):
 else:
     xdg_config_home = Path.joinpath(Path.home(), ".config")
 
+CHANNELS_FILE = Path.joinpath(xdg_config_home, about.APP_NAME, "channels.ini")
 
+
+# A config file can be read only once, so the options are kept for the next calls.
+@lru_cache(maxsize=None)
 def get_config(config_file: Optional[TextIO] = None) -> dict:
     """Parse a config file."""
     config = ConfigParser()
@@ -30,7 +36,18 @@ def get_config(config_file: Optional[TextIO] = None) -> dict:
         config.read_file(config_file)
     except FileNotFoundError:
         pass
-    options = {"playlist_fetching": {"max_videos_count": 5}}
+    options: dict = {
+        "playlist_fetching": {"max_videos_count": 5, "prefetch_count": 5},
+        "extraction": {"max_workers": 8, "timeout": 30.0},
+        "cache": {"max_size": 50, "video_ttl": 21600.0, "listing_ttl": 300.0},
+        "following_channels": {
+            "status_backend": "gql",
+            "gql_url": "https://gql.twitch.tv/gql",
+        },
+        "daemon": {"min_interval": 30.0, "max_interval": 600.0},
+        "player": {"reuse": "no"},
+        "quality": {"safety_margin": 0.75, "probe_ttl": 300.0},
+    }
 
     try:
         options["playlist_fetching"]["max_videos_count"] = config.getint(
@@ -39,18 +56,99 @@ def get_config(config_file: Optional[TextIO] = None) -> dict:
     except (NoOptionError, NoSectionError):
         pass
 
+    try:
+        options["playlist_fetching"]["prefetch_count"] = config.getint(
+            "playlist_fetching", "prefetch_count"
+        )
+    except (NoOptionError, NoSectionError):
+        pass
+
+    try:
+        options["extraction"]["max_workers"] = config.getint(
+            "extraction", "max_workers"
+        )
+    except (NoOptionError, NoSectionError):
+        pass
+
+    try:
+        options["extraction"]["timeout"] = config.getfloat("extraction", "timeout")
+    except (NoOptionError, NoSectionError):
+        pass
+
+    try:
+        options["following_channels"]["status_backend"] = config.get(
+            "following_channels", "status_backend"
+        )
+    except (NoOptionError, NoSectionError):
+        pass
+
+    try:
+        options["following_channels"]["gql_url"] = config.get(
+            "following_channels", "gql_url"
+        )
+    except (NoOptionError, NoSectionError):
+        pass
+
+    try:
+        options["cache"]["max_size"] = config.getint("cache", "max_size")
+    except (NoOptionError, NoSectionError):
+        pass
+
+    try:
+        options["cache"]["video_ttl"] = config.getfloat("cache", "video_ttl")
+    except (NoOptionError, NoSectionError):
+        pass
+
+    try:
+        options["cache"]["listing_ttl"] = config.getfloat("cache", "listing_ttl")
+    except (NoOptionError, NoSectionError):
+        pass
+
+    try:
+        options["daemon"]["min_interval"] = config.getfloat("daemon", "min_interval")
+    except (NoOptionError, NoSectionError):
+        pass
+
+    try:
+        options["daemon"]["max_interval"] = config.getfloat("daemon", "max_interval")
+    except (NoOptionError, NoSectionError):
+        pass
+
+    try:
+        options["player"]["reuse"] = config.get("player", "reuse")
+    except (NoOptionError, NoSectionError):
+        pass
+
+    try:
+        options["quality"]["safety_margin"] = config.getfloat(
+            "quality", "safety_margin"
+        )
+    except (NoOptionError, NoSectionError):
+        pass
+
+    try:
+        options["quality"]["probe_ttl"] = config.getfloat("quality", "probe_ttl")
+    except (NoOptionError, NoSectionError):
+        pass
+
     return options
 
 
+def get_max_workers(args: Namespace) -> int:
+    """Return the maximum number of extractions that run at the same time."""
+    return max(
+        1,
+        args.max_workers or get_config(args.config_file)["extraction"]["max_workers"],
+    )
+
+
 def get_following_channels(channels_file: Optional[TextIO] = None) -> tuple:
     """Parse the following channels' list from a file."""
     channels = ConfigParser()
 
     try:
         if channels_file is None:
-            channels_file = open(
-                Path.joinpath(xdg_config_home, about.APP_NAME, "channels.ini"), "r"
-            )
+            channels_file = open(CHANNELS_FILE, "r")
 
         channels.read_file(channels_file)
     except FileNotFoundError:
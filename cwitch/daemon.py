@@ -0,0 +1,133 @@
+"""Track the following channels continuously and keep their live status in a file."""
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict
+from typing import Optional
+
+from . import __about__ as about
+from . import live_status
+from .cache import read_json
+from .cache import write_json
+from .cache import xdg_runtime_dir
+
+STATE_FILE = Path.joinpath(xdg_runtime_dir, about.APP_NAME, "daemon.json")
+
+
+def is_process_running(pid: int) -> bool:
+    """Check if a process with the pid exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # It exists, but it's owned by another user.
+        return True
+    return True
+
+
+def read_state(max_age: float, state_file: Path = STATE_FILE) -> Optional[dict]:
+    """Return the channels' status from a running daemon, if it's updated recently."""
+    state = read_json(state_file)
+    if state is None or time.time() - state.get("updated", 0) > max_age:
+        return None
+
+    # A pid of 0 or less would signal a whole process group, so it can't be checked.
+    pid = state.get("pid")
+    if not isinstance(pid, int) or pid <= 0 or not is_process_running(pid):
+        return None
+
+    return state.get("channels")
+
+
+def get_live_probability(history: list, hour: int) -> float:
+    """Return how likely a channel is live at an hour, from the observed history."""
+    live_count, checks_count = history[hour]
+    # Start from 50% for hours without observations.
+    return (live_count + 1) / (checks_count + 2)
+
+
+def get_check_interval(
+    history: list, is_live: bool, min_interval: float, max_interval: float
+) -> float:
+    """Return the seconds until the next check of a channel.
+
+    Live channels and channels that are usually live at this hour are checked often,
+    dormant channels are checked rarely.
+    """
+    if is_live:
+        return min_interval
+
+    probability = get_live_probability(history, datetime.now().hour)
+    return max_interval - (max_interval - min_interval) * probability
+
+
+def run_daemon(
+    channels: tuple,
+    gql_url: str = live_status.GQL_URL,
+    min_interval: float = 30,
+    max_interval: float = 600,
+    timeout: Optional[float] = None,
+    state_file: Path = STATE_FILE,
+) -> None:
+    """Poll the channels' status forever, and write it to the state file."""
+    logins = tuple(dict.fromkeys(channel["id"].lower() for channel in channels))
+
+    # Keep learning from the previous runs.
+    history: Dict[str, list] = (read_json(state_file) or {}).get("history") or {}
+
+    status: Dict[str, dict] = {}
+    next_checks = dict.fromkeys(logins, 0.0)
+
+    try:
+        while True:
+            now = time.time()
+            due_logins = [login for login in logins if next_checks[login] <= now]
+
+            try:
+                new_status = live_status.fetch_live_status(due_logins, gql_url, timeout)
+            except (OSError, ValueError) as error:
+                print(f"Error: Can't check the channels status ({error}).", flush=True)
+                for login in due_logins:
+                    next_checks[login] = now + min_interval
+            else:
+                hour = datetime.now().hour
+                for login, stream in new_status.items():
+                    channel_history = history.setdefault(login, [[0, 0]] * 24)
+                    channel_history[hour] = [
+                        channel_history[hour][0] + bool(stream),
+                        channel_history[hour][1] + 1,
+                    ]
+
+                    was_live = status.get(login, {}).get("live")
+                    if login in status and was_live != bool(stream):
+                        print(
+                            f"({login}) is {'online' if stream else 'offline'}",
+                            flush=True,
+                        )
+
+                    status[login] = {
+                        "live": bool(stream),
+                        "checked": now,
+                        **(stream or {}),
+                    }
+                    next_checks[login] = now + get_check_interval(
+                        channel_history, bool(stream), min_interval, max_interval
+                    )
+
+            write_json(
+                state_file,
+                {
+                    "pid": os.getpid(),
+                    "updated": now,
+                    "channels": status,
+                    "history": history,
+                },
+            )
+
+            time.sleep(max(1.0, min(next_checks.values()) - time.time()))
+    finally:
+        # Clients shouldn't trust the status after the daemon stops.
+        if (read_json(state_file) or {}).get("pid") == os.getpid():
+            write_json(state_file, {"history": history})
@@ -0,0 +1,128 @@
+"""Run blocking extractions as cancellable asyncio tasks."""
+import asyncio
+import threading
+from concurrent.futures import Future
+from types import TracebackType
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import Type
+
+from . import timings
+
+
+class Engine(object):
+    """An event loop in a background thread that runs extractions with limits.
+
+    Every extraction runs in its own daemon thread and is awaited by a task, so it
+    can time out or be cancelled at once. A cancelled extraction is abandoned, and it
+    never delays exiting. The number of running extractions is limited, including
+    the abandoned ones, so they can't pile up.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        """Start the event loop."""
+        self.max_workers = max(1, max_workers)
+        self.semaphore: Optional[asyncio.Semaphore] = None
+
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.run_loop)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def run_loop(self) -> None:
+        """Run the loop until it is stopped, then close it."""
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+
+    def __enter__(self) -> "Engine":
+        """Use the engine in a with statement."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Cancel what is still running, then stop the loop."""
+        self.close()
+
+    def call_in_loop(self, callback: Callable, *args) -> None:
+        """Call a function in the loop's thread, unless the loop is already closed."""
+        try:
+            self.loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            pass
+
+    async def extract(
+        self, function: Callable, *args, timeout: Optional[float] = None
+    ) -> Any:
+        """Run a blocking function in a daemon thread and wait for its result."""
+        if self.semaphore is None:
+            # It must be created inside the loop.
+            self.semaphore = asyncio.Semaphore(self.max_workers)
+        semaphore = self.semaphore
+
+        await semaphore.acquire()
+        result_future = self.loop.create_future()
+
+        def set_result(result: Any) -> None:
+            if not result_future.done():
+                result_future.set_result(result)
+
+        def set_exception(error: BaseException) -> None:
+            if not result_future.done():
+                result_future.set_exception(error)
+
+        name = getattr(function, "__name__", "extraction")
+        if args:
+            name += f"({str(args[0])[:60]})"
+
+        def run() -> None:
+            try:
+                with timings.span(name, "extraction"):
+                    result = function(*args)
+            except Exception as error:
+                self.call_in_loop(set_exception, error)
+            else:
+                self.call_in_loop(set_result, result)
+            finally:
+                # The slot is free only when the thread is done, even if it timed out.
+                self.call_in_loop(semaphore.release)
+
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+
+        return await asyncio.wait_for(result_future, timeout)
+
+    def submit(
+        self, function: Callable, *args, timeout: Optional[float] = None
+    ) -> Future:
+        """Start an extraction and return a future for its result.
+
+        The timeout starts when the extraction starts running, not when it's queued.
+        When it is reached, the future raises an asyncio.TimeoutError.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self.extract(function, *args, timeout=timeout), self.loop
+        )
+
+    async def cancel_tasks(self) -> None:
+        """Cancel all the other tasks and wait for them to handle it."""
+        tasks = asyncio.all_tasks() - {asyncio.current_task()}
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def close(self) -> None:
+        """Cancel all the extractions and stop the loop, without waiting for them."""
+        try:
+            future = asyncio.run_coroutine_threadsafe(self.cancel_tasks(), self.loop)
+        except RuntimeError:
+            # It's already closed.
+            return
+        future.add_done_callback(lambda _future: self.call_in_loop(self.loop.stop))
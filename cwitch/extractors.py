@@ -1,15 +1,41 @@
 """Use yt-dlp to extract videos and streams data from Twitch channels."""
+import atexit
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Dict
+from typing import Iterator
+from typing import List
 from typing import Optional
 
 import yt_dlp
 
+from . import cache
+from .live_status import GQL_URL
+from .media import from_info
+from .media import Media
+from .media import to_info
+from .new_videos import fetch_videos_pages
+from .new_videos import media_from_node
+from .new_videos import PAGE_SIZE
+
 # from urllib.parse import urljoin
 
 BASE_URL = "https://www.twitch.tv"
+# The GQL broadcast type of every videos filter.
+BROADCAST_TYPES = {
+    "archives": "ARCHIVE",
+    "highlights": "HIGHLIGHT",
+    "uploads": "UPLOAD",
+    "past_premieres": "PAST_PREMIERE",
+}
 
 
 class Logger(object):
-    """Logger for yt-dlp."""
+    """Logger for yt-dlp.
+
+    It prints to the standard error, so it doesn't mix with the JSON output.
+    """
 
     def __init__(self, verbosity: bool) -> None:
         """Take the verbosity mode."""
@@ -22,67 +48,232 @@ class Logger(object):
     def warning(self, msg: str) -> None:
         """Don't print warning messages, unless verbosity is enabled."""
         if self.verbosity:
-            print(msg)
+            print(msg, file=sys.stderr)
 
     def error(self, msg: str) -> None:
         """Handle error messages."""
         if msg.endswith(" does not exist"):
-            print(msg)
+            print(msg, file=sys.stderr)
         elif msg.endswith(" is offline"):
             pass
 
 
-def extract_channel_videos(
-    channel_name: str,
-    count: int,
-    playlist_start: int,
-    search_filter: str = "all",
-    sort_method: str = "time",
-    reverse: bool = False,
-    random: bool = False,
-    verbosity: bool = False,
-) -> dict:
-    """Return a channel's videos data."""
-    ydl_opts = {
-        "simulate": True,
-        "quiet": True,
-        "logger": Logger(verbosity),
-        "playliststart": playlist_start,
-        "playlistend": playlist_start + count - 1,
-        "playlistreverse": reverse,
-        "playlistrandom": random,
-    }
-
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        return ydl.extract_info(
-            f"{BASE_URL}/{channel_name}/videos?filter={search_filter}&sort={sort_method}"
-        )
-
-
-def extract_stream(channel_name: str, verbosity: bool = False) -> Optional[dict]:
+def create_ydl(verbosity: bool, **options) -> yt_dlp.YoutubeDL:
+    """Return a YoutubeDL object that only extracts data."""
+    return yt_dlp.YoutubeDL(
+        {
+            "simulate": True,
+            "quiet": True,
+            "logger": Logger(verbosity),
+            **options,
+        }
+    )
+
+
+class YoutubeDLPool(object):
+    """Keep idle YoutubeDL objects to reuse them in the next extractions.
+
+    An object is used by one thread at a time, so the pool grows to the number of
+    workers, and every object keeps its initialized extractors and HTTP connections.
+    """
+
+    def __init__(self) -> None:
+        """Start with an empty pool."""
+        self.lock = threading.Lock()
+        self.idle: Dict[tuple, List[yt_dlp.YoutubeDL]] = {}
+
+    @contextmanager
+    def acquire(self, verbosity: bool, **options) -> Iterator[yt_dlp.YoutubeDL]:
+        """Borrow an object with the given options, and create it if there is none."""
+        key = (verbosity, tuple(sorted(options.items())))
+
+        with self.lock:
+            idle = self.idle.setdefault(key, [])
+            ydl = idle.pop() if idle else None
+
+        if ydl is None:
+            ydl = create_ydl(verbosity, **options)
+
+        try:
+            yield ydl
+        finally:
+            with self.lock:
+                idle.append(ydl)
+
+    def close(self) -> None:
+        """Close all the idle objects."""
+        with self.lock:
+            for idle in self.idle.values():
+                for ydl in idle:
+                    ydl.close()
+            self.idle.clear()
+
+
+ydl_pool = YoutubeDLPool()
+atexit.register(ydl_pool.close)
+
+
+class ChannelVideosSession(object):
+    """Fetch a channel's videos list page by page, from Twitch GQL.
+
+    The upstream cursor is kept between pages, so every page costs one request no
+    matter how deep it is in the list.
+    """
+
+    def __init__(
+        self,
+        channel_name: str,
+        search_filter: str = "all",
+        sort_method: str = "time",
+        url: str = GQL_URL,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """Take the channel and how to filter and sort its videos."""
+        self.channel_name = channel_name
+        self.search_filter = search_filter
+        self.sort_method = sort_method
+        self.url = url
+        self.timeout = timeout
+
+        # How many videos are returned and how many are fetched from upstream.
+        self.offset = 0
+        self.fetched_count = 0
+        # Fetched entries that aren't returned yet.
+        self.buffer: List[Media] = []
+        self.cursor: Optional[str] = None
+        self.has_more = True
+        self.lock = threading.Lock()
+
+        self.prefetch_cancelled = False
+        self.prefetch_error: Optional[Exception] = None
+
+    def fetch_entries(self, end: int, cancellable: bool = False) -> None:
+        """Fetch entries from upstream to the buffer, until the end position.
+
+        When it's cancellable, it stops early after the prefetch is cancelled.
+        """
+        login = self.channel_name.lower()
+
+        while self.has_more and self.fetched_count < end:
+            # Stop between pages, so no more pages are requested.
+            if cancellable and self.prefetch_cancelled:
+                break
+
+            limit = min(end - self.fetched_count, PAGE_SIZE)
+            edges = fetch_videos_pages(
+                {login: self.cursor},
+                {login: limit},
+                self.url,
+                self.timeout,
+                self.sort_method.upper(),
+                BROADCAST_TYPES.get(self.search_filter),
+            )[login]
+
+            for edge in edges:
+                node = edge.get("node") or {}
+                if node.get("id"):
+                    self.buffer.append(
+                        media_from_node(node)._replace(
+                            playlist_index=self.fetched_count + 1
+                        )
+                    )
+                    self.fetched_count += 1
+
+            self.cursor = edges[-1].get("cursor") if edges else None
+            self.has_more = len(edges) == limit and self.cursor is not None
+
+    def take_entries(self, count: int) -> List[Media]:
+        """Return the next entries, skipping the ones that were given from cache."""
+        if self.prefetch_error:
+            error, self.prefetch_error = self.prefetch_error, None
+            raise error
+
+        self.fetch_entries(self.offset + count)
+
+        # Drop the buffered entries that were given from cache.
+        del self.buffer[: self.offset - (self.fetched_count - len(self.buffer))]
+
+        entries = self.buffer[:count]
+        del self.buffer[:count]
+        return entries
+
+    def prefetch(self, count: int) -> None:
+        """Fetch the next entries to the buffer, until it is cancelled.
+
+        It blocks, so run it in the background while the last page is shown.
+        """
+        with self.lock:
+            if self.prefetch_cancelled:
+                return
+
+            try:
+                self.fetch_entries(self.offset + count, cancellable=True)
+            except (OSError, ValueError) as error:
+                # Raise it when the entries are requested.
+                self.prefetch_error = error
+
+    def cancel_prefetch(self) -> None:
+        """Stop prefetching entries that won't be requested."""
+        self.prefetch_cancelled = True
+
+    def next_page(self, count: int) -> List[Media]:
+        """Return the next flat entries of the list, without their formats."""
+        with self.lock:
+            metadata_cache = cache.metadata_cache
+
+            key = (
+                f"channel/{self.channel_name.lower()}/{self.search_filter}/"
+                + f"{self.sort_method}/{self.offset + 1}-{self.offset + count}"
+            )
+            entries = None
+            if metadata_cache:
+                cached_entries = metadata_cache.read(key, metadata_cache.listing_ttl)
+                if cached_entries is not None:
+                    entries = [from_info(entry) for entry in cached_entries]
+
+            if entries is None:
+                entries = self.take_entries(count)
+
+                if entries and metadata_cache:
+                    metadata_cache.write(key, [to_info(entry) for entry in entries])
+
+            self.offset += len(entries)
+            # It's a new page, so it can be prefetched again.
+            self.prefetch_cancelled = False
+            return entries
+
+
+def extract_stream(
+    channel_name: str, verbosity: bool = False, timeout: Optional[float] = None
+) -> Optional[Media]:
     """Return data about a steam if there was an active one on the input channel."""
-    ydl_opts = {
-        "simulate": True,
-        "quiet": True,
-        "ignoreerrors": True,
-        "logger": Logger(verbosity),
-    }
-
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+    with ydl_pool.acquire(verbosity, ignoreerrors=True, socket_timeout=timeout) as ydl:
         try:
-            return ydl.extract_info(f"{BASE_URL}/{channel_name}")
+            stream_info = ydl.extract_info(f"{BASE_URL}/{channel_name}")
         except yt_dlp.utils.DownloadError:
             return None
 
+    return from_info(stream_info) if stream_info else None
 
-def extract_video(video_id: str, verbosity: bool = False) -> dict:
+
+def extract_video(video_id: str, verbosity: bool = False) -> Optional[Media]:
     """Return data about a video from it's id."""
-    ydl_opts = {
-        "simulate": True,
-        "quiet": True,
-        "ignoreerrors": True,
-        "logger": Logger(verbosity),
-    }
-
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        return ydl.extract_info(f"{BASE_URL}/videos/{video_id}")
+    metadata_cache = cache.metadata_cache
+
+    key = f"video/{video_id}"
+    if metadata_cache:
+        video_info = metadata_cache.read(key, metadata_cache.video_ttl)
+        if video_info:
+            return from_info(video_info)
+
+    with ydl_pool.acquire(verbosity, ignoreerrors=True) as ydl:
+        video_info = ydl.extract_info(f"{BASE_URL}/videos/{video_id}")
+    if not video_info:
+        return None
+
+    # The info dict is dropped here, only the record is kept.
+    video_data = from_info(video_info)
+    if metadata_cache:
+        metadata_cache.write(key, to_info(video_data))
+
+    return video_data
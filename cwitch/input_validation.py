@@ -9,25 +9,30 @@ from prompt_toolkit.validation import Validator
 class NumbersListValidator(Validator):
     """Input validation when asking for the media indexes."""
 
-    def __init__(self, existing_media: KeysView) -> None:
-        """Take a list of the existing media."""
+    def __init__(self, existing_media: KeysView, allow_extra: bool = True) -> None:
+        """Take a list of the existing media, and whether extra media can be asked."""
         self.existing_media = existing_media
+        self.allow_extra = allow_extra
+
+    def is_extra(self, value: str) -> bool:
+        """Check if a value asks for extra media, like 'x' or 'x13'."""
+        return (
+            self.allow_extra
+            and value[0] == "x"
+            and (value[1:].isdigit() or value[1:] == "")
+        )
 
     def validate(self, document: Document) -> None:
         """Check if the input contains only numbers from the media list."""
         text = document.text
         values = text.split()
 
-        if text and not all(
-            (
-                v.isdigit() or (v[0] == "x" and (v[1:].isdigit() or v[1:] == ""))
-                for v in values
-            )
-        ):
+        if text and not all((v.isdigit() or self.is_extra(v) for v in values)):
+            allowed_characters = (" ", "x") if self.allow_extra else (" ",)
             # Get index of first non numeric character.
             # We want to move the cursor here.
             for _i, c in enumerate(text):
-                if not c.isdigit() and c not in (" ", "x"):
+                if not c.isdigit() and c not in allowed_characters:
                     break
 
             raise ValidationError(
@@ -35,16 +40,12 @@ class NumbersListValidator(Validator):
                 cursor_position=_i,
             )
         elif text and not all(
-            (
-                v in self.existing_media
-                or (v[0] == "x" and (v[1:].isdigit()) or v[1:] == "")
-                for v in values
-            )
+            (v in self.existing_media or self.is_extra(v) for v in values)
         ):
             # Get index of first non existing media.
             # We want to move the cursor here.
             for value in values:
-                if value not in self.existing_media:
+                if value not in self.existing_media and not self.is_extra(value):
                     i = text.index(value)
                     break
 
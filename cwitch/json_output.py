@@ -0,0 +1,234 @@
+"""Write the results as JSON for scripts, without prompts, printers or a player."""
+import asyncio
+import json
+import sys
+import time
+from argparse import Namespace
+from concurrent.futures import as_completed
+from datetime import datetime
+from datetime import timezone
+from typing import Dict
+from typing import Iterator
+from typing import Optional
+
+from . import cache
+from . import daemon
+from . import live_status
+from .config import get_config
+from .config import get_following_channels
+from .config import get_max_workers
+from .engine import Engine
+from .media import Media
+
+
+def format_timestamp(timestamp: Optional[float]) -> Optional[str]:
+    """Return a timestamp in the same format as the Twitch API."""
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime(
+        "%Y-%m-%dT%H:%M:%SZ"
+    )
+
+
+def stream_record(channel: dict, stream_data: Optional[Media]) -> dict:
+    """Return the record of a channel from its extracted stream."""
+    return {
+        "name": channel["name"],
+        "id": channel["id"],
+        "live": bool(stream_data),
+        "title": stream_data.description if stream_data else None,
+        "viewer_count": stream_data.view_count if stream_data else None,
+        "game": None,
+        "started_at": format_timestamp(stream_data.timestamp if stream_data else None),
+    }
+
+
+def status_record(channel: dict, status: Optional[dict]) -> dict:
+    """Return the record of a channel from its GQL status."""
+    is_live = bool(status and status.get("live", True))
+    return {
+        "name": channel["name"],
+        "id": channel["id"],
+        "live": is_live,
+        "title": status.get("title") if status and is_live else None,
+        "viewer_count": status.get("viewer_count") if status and is_live else None,
+        "game": status.get("game") if status and is_live else None,
+        "started_at": status.get("started_at") if status and is_live else None,
+    }
+
+
+def check_channels_status(
+    channels: tuple, gql_url: str, max_age: float, timeout: float
+) -> Iterator[dict]:
+    """Yield the record of every channel, from a running daemon or one request."""
+    status: Dict[str, Optional[dict]] = dict(daemon.read_state(max_age) or {})
+    untracked_logins = [
+        channel["id"] for channel in channels if channel["id"].lower() not in status
+    ]
+    if untracked_logins:
+        status.update(live_status.fetch_live_status(untracked_logins, gql_url, timeout))
+
+    for channel in channels:
+        yield status_record(channel, status.get(channel["id"].lower()))
+
+
+def check_channels_streams(
+    args: Namespace, channels: tuple, timeout: float
+) -> Iterator[dict]:
+    """Yield the record of every channel as soon as its stream is extracted."""
+    from . import extractors
+
+    with Engine(get_max_workers(args)) as engine:
+        futures = {
+            engine.submit(
+                extractors.extract_stream,
+                channel["id"],
+                args.verbosity,
+                timeout,
+                timeout=timeout,
+            ): channel
+            for channel in channels
+        }
+
+        for future in as_completed(futures):
+            channel = futures[future]
+            try:
+                yield stream_record(channel, future.result())
+            except asyncio.TimeoutError:
+                yield {
+                    "name": channel["name"],
+                    "id": channel["id"],
+                    "live": None,
+                    "error": "timed out",
+                }
+
+
+def following_channels_records(args: Namespace) -> Iterator[dict]:
+    """Yield the status of every following channel."""
+    channels = get_following_channels(args.channels_file)
+    config = get_config(args.config_file)
+    timeout = args.timeout or config["extraction"]["timeout"]
+
+    records: Optional[Iterator[dict]] = None
+    if config["following_channels"]["status_backend"] == "gql":
+        try:
+            records = iter(
+                tuple(
+                    check_channels_status(
+                        channels,
+                        config["following_channels"]["gql_url"],
+                        2 * config["daemon"]["max_interval"],
+                        timeout,
+                    )
+                )
+            )
+        except (OSError, ValueError) as error:
+            print(
+                f"Warning: Can't check the channels at once ({error}), "
+                + "checking them one by one.",
+                file=sys.stderr,
+            )
+    if records is None:
+        records = check_channels_streams(args, channels, timeout)
+
+    statuses = {}
+    for record in records:
+        if record["live"] is not None:
+            statuses[record["id"].lower()] = [
+                time.time(),
+                record["live"],
+                record["title"],
+                record["viewer_count"],
+            ]
+        if record["live"] or not args.online:
+            yield record
+
+    if not args.no_cache:
+        cache.write_status_snapshot(statuses)
+
+
+def channel_records(args: Namespace) -> Iterator[dict]:
+    """Yield a channel's live stream, or its videos list."""
+    from . import extractors
+
+    if args.stream:
+        stream_data = extractors.extract_stream(args.channel_id, args.verbosity)
+        yield stream_record(
+            {"name": args.channel_id, "id": args.channel_id}, stream_data
+        )
+        return
+
+    config = get_config(args.config_file)
+    videos_session = extractors.ChannelVideosSession(
+        args.channel_id,
+        url=config["following_channels"]["gql_url"],
+        timeout=config["extraction"]["timeout"],
+    )
+    try:
+        videos_list = videos_session.next_page(
+            args.max_list_length or config["playlist_fetching"]["max_videos_count"]
+        )
+    except (OSError, ValueError) as error:
+        print(f"Error: Can't list the videos ({error}).", file=sys.stderr)
+        return
+
+    for video in videos_list:
+        yield {
+            "index": video.playlist_index,
+            "id": video.media_id.lstrip("v"),
+            "title": video.title,
+            "url": video.webpage_url,
+            "duration": video.duration,
+            "view_count": video.view_count,
+            "published_at": format_timestamp(video.timestamp),
+        }
+
+
+def new_videos_records(args: Namespace) -> Iterator[dict]:
+    """Yield the new videos of the following channels, the newest first."""
+    from . import new_videos
+
+    config = get_config(args.config_file)
+    # Scripts might poll it, so the videos stay new for the interactive subcommand.
+    videos_list = new_videos.check_new_videos(
+        get_following_channels(args.channels_file),
+        config["following_channels"]["gql_url"],
+        args.timeout or config["extraction"]["timeout"],
+        config["playlist_fetching"]["max_videos_count"],
+        mark_seen=False,
+    )
+
+    for video in videos_list:
+        yield {
+            "index": video.playlist_index,
+            "channel": video.uploader,
+            "id": video.media_id.lstrip("v"),
+            "title": video.title,
+            "url": video.webpage_url,
+            "duration": video.duration,
+            "view_count": video.view_count,
+            "published_at": format_timestamp(video.timestamp),
+        }
+
+
+def write_records(args: Namespace) -> int:
+    """Write the subcommand's records as JSON Lines while they come, or as a JSON list."""
+    if args.subcommand == "s":
+        records = following_channels_records(args)
+    elif args.subcommand == "new":
+        records = new_videos_records(args)
+    else:
+        records = channel_records(args)
+
+    if args.output_format == "jsonl":
+        count = 0
+        for record in records:
+            print(json.dumps(record), flush=True)
+            count += 1
+    else:
+        records_list = list(records)
+        json.dump(records_list, sys.stdout)
+        print()
+        count = len(records_list)
+
+    return 0 if count else 1
@@ -0,0 +1,115 @@
+"""Check the live status of many channels with few Twitch GQL requests."""
+import json
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from urllib.request import Request
+from urllib.request import urlopen
+
+GQL_URL = "https://gql.twitch.tv/gql"
+# The public client ID used by the Twitch website (and by yt-dlp).
+CLIENT_ID = "ue6666qo983tsx6so1t0vnawi233wa"
+# Twitch doesn't accept more logins than this in one `users` query.
+MAX_LOGINS_PER_QUERY = 100
+# Twitch doesn't answer more operations than this in one request.
+MAX_OPERATIONS_PER_REQUEST = 35
+
+USERS_QUERY = """
+query LiveStatus($logins: [String!]) {
+  users(logins: $logins) {
+    login
+    displayName
+    stream {
+      id
+      title
+      type
+      viewersCount
+      createdAt
+      game {
+        name
+      }
+    }
+  }
+}
+"""
+
+
+def post_gql(
+    operations: List[dict], url: str = GQL_URL, timeout: Optional[float] = None
+) -> List[dict]:
+    """Send GQL operations in batches, and return their results in the same order.
+
+    A ValueError is raised when an operation isn't answered with data, so a failed
+    request isn't mistaken for empty results.
+    """
+    results: List[dict] = []
+
+    for start in range(0, len(operations), MAX_OPERATIONS_PER_REQUEST):
+        end = start + MAX_OPERATIONS_PER_REQUEST
+        request = Request(
+            url,
+            data=json.dumps(operations[start:end]).encode(),
+            headers={"Client-ID": CLIENT_ID, "Content-Type": "application/json"},
+        )
+        with urlopen(request, timeout=timeout) as response:
+            batch_results = json.load(response)
+
+        # A single operation might be answered with an object instead of a list.
+        if isinstance(batch_results, dict):
+            batch_results = [batch_results]
+        if not isinstance(batch_results, list):
+            raise ValueError("GQL answered with an invalid response")
+
+        for result in batch_results:
+            if not isinstance(result, dict):
+                raise ValueError("GQL answered with an invalid result")
+            if result.get("errors"):
+                raise ValueError(f"GQL answered with errors: {result['errors']}")
+            if result.get("data") is None:
+                raise ValueError("GQL answered without data")
+        results.extend(batch_results)
+
+    return results
+
+
+def fetch_live_status(
+    logins: Iterable[str], url: str = GQL_URL, timeout: Optional[float] = None
+) -> Dict[str, Optional[dict]]:
+    """Return the stream status for every login, or None when it is offline.
+
+    The logins are sent in batches of GQL queries, so it takes few HTTP requests.
+    """
+    status: Dict[str, Optional[dict]] = {login.lower(): None for login in logins}
+    all_logins = tuple(status)
+
+    operations = []
+    for start in range(0, len(all_logins), MAX_LOGINS_PER_QUERY):
+        end = start + MAX_LOGINS_PER_QUERY
+        operations.append(
+            {
+                "operationName": "LiveStatus",
+                "query": USERS_QUERY,
+                "variables": {"logins": all_logins[start:end]},
+            }
+        )
+
+    for result in post_gql(operations, url, timeout):
+        for user in (result.get("data") or {}).get("users") or ():
+            if not user or not user.get("stream"):
+                # Offline channels have a null stream, and unknown ones a null user.
+                continue
+
+            stream = user["stream"]
+            status[user["login"].lower()] = {
+                "id": stream.get("id"),
+                "login": user["login"],
+                "display_name": user.get("displayName"),
+                "title": stream.get("title"),
+                "type": stream.get("type"),
+                "viewer_count": stream.get("viewersCount"),
+                "started_at": stream.get("createdAt"),
+                "game": (stream.get("game") or {}).get("name"),
+            }
+
+    return status
@@ -0,0 +1,105 @@
+"""Compact records of the extracted videos and streams.
+
+A yt-dlp info dict has every format's details, all the thumbnails and HTTP headers,
+while only a few fields are printed and played. The records keep only them, so the
+info dicts can be dropped as soon as they are extracted.
+"""
+from typing import Dict
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+
+class MediaFormat(NamedTuple):
+    """A row of a media's formats table."""
+
+    format_id: str
+    url: str
+    # The total bitrate in kbit/s.
+    tbr: Optional[float] = None
+    vcodec: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    fps: Optional[float] = None
+
+
+class Media(NamedTuple):
+    """A video or a stream, or a flat entry of a videos list without formats."""
+
+    media_id: str
+    title: str
+    webpage_url: str
+    playlist_index: Optional[int] = None
+    timestamp: Optional[float] = None
+    duration: Optional[float] = None
+    view_count: Optional[int] = None
+    uploader: Optional[str] = None
+    # A stream's title, the title has the channel name and the time.
+    description: Optional[str] = None
+    thumbnail: Optional[str] = None
+    subtitles: Tuple[str, ...] = ()
+    # The format that yt-dlp picked as the best one.
+    format_id: Optional[str] = None
+    http_headers: Optional[Dict[str, str]] = None
+    # From the lowest to the highest quality, as yt-dlp sorts them.
+    formats: Tuple[MediaFormat, ...] = ()
+
+    @property
+    def webpage_url_basename(self) -> str:
+        """Return the last part of the webpage URL, the video ID or channel name."""
+        return self.webpage_url.rstrip("/").split("/")[-1]
+
+    @property
+    def selected_format(self) -> Optional[MediaFormat]:
+        """Return the format that yt-dlp picked, or the highest quality one."""
+        for media_format in self.formats:
+            if media_format.format_id == self.format_id:
+                return media_format
+        return self.formats[-1] if self.formats else None
+
+
+def from_info(info: dict, playlist_index: Optional[int] = None) -> Media:
+    """Build a record from a yt-dlp info dict, or a dict written by to_info."""
+    formats = tuple(
+        MediaFormat(
+            f["format_id"],
+            f["url"],
+            f.get("tbr"),
+            f.get("vcodec"),
+            f.get("width"),
+            f.get("height"),
+            f.get("fps"),
+        )
+        for f in info.get("formats") or ()
+    )
+    http_headers = info.get("http_headers")
+    if http_headers is None and info.get("formats"):
+        # The formats of a media have the same headers.
+        http_headers = info["formats"][-1].get("http_headers")
+
+    return Media(
+        media_id=info["id"],
+        title=info.get("title") or "",
+        # Flat entries have only the URL of their webpage.
+        webpage_url=info.get("webpage_url") or info["url"],
+        playlist_index=info.get("playlist_index") or playlist_index,
+        timestamp=info.get("timestamp"),
+        duration=info.get("duration"),
+        view_count=info.get("view_count"),
+        uploader=info.get("uploader"),
+        description=info.get("description"),
+        thumbnail=info.get("thumbnail"),
+        subtitles=tuple(info.get("subtitles") or ()),
+        format_id=info.get("format_id"),
+        http_headers=http_headers,
+        formats=formats,
+    )
+
+
+def to_info(media: Media) -> dict:
+    """Return a record as a JSON serializable dict, that from_info reads back."""
+    info = media._asdict()
+    info["id"] = info.pop("media_id")
+    info["formats"] = [media_format._asdict() for media_format in media.formats]
+    info["subtitles"] = list(media.subtitles)
+    return info
@@ -0,0 +1,69 @@
+"""Control a running mpv player over its JSON IPC socket."""
+import json
+import socket
+from pathlib import Path
+from typing import List
+from typing import Tuple
+
+from . import __about__ as about
+from .cache import xdg_runtime_dir
+
+SOCKET_PATH = Path.joinpath(xdg_runtime_dir, about.APP_NAME, "mpv.sock")
+
+
+def get_titled_url(url: str, title: str) -> str:
+    """Return a URL with a title that is shown in mpv's playlist."""
+    # Since mpv discards what is beyond the #, we can use it as a title in the playlist
+    return url + "#" + title
+
+
+def send_commands(commands: List[list], socket_path: Path = SOCKET_PATH) -> bool:
+    """Send commands to the mpv that listens on the socket, and wait for the replies.
+
+    Return False when there is no running mpv to send them to.
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(5)
+            client.connect(str(socket_path))
+
+            for request_id, command in enumerate(commands, start=1):
+                client.sendall(
+                    json.dumps({"command": command, "request_id": request_id}).encode()
+                    + b"\n"
+                )
+
+            # Events are sent on the same socket, so only the replies are counted.
+            replies_count = 0
+            with client.makefile("r") as replies:
+                while replies_count < len(commands):
+                    line = replies.readline()
+                    if not line:
+                        # The player has closed.
+                        return False
+                    if "request_id" in json.loads(line):
+                        replies_count += 1
+    except (OSError, ValueError):
+        return False
+
+    return True
+
+
+def load_playlist(
+    playlist: List[Tuple[str, str]], replace: bool, socket_path: Path = SOCKET_PATH
+) -> bool:
+    """Add (url, title) items to a running mpv's playlist, or replace its playlist.
+
+    Return False when there is no running mpv.
+    """
+    commands = []
+    for i, (url, title) in enumerate(playlist):
+        if replace and i == 0:
+            flag = "replace"
+        else:
+            # It starts playing when the player is idle.
+            flag = "append-play"
+
+        commands.append(["loadfile", get_titled_url(url, title), flag])
+
+    return send_commands(commands, socket_path)
@@ -0,0 +1,222 @@
+"""Find the videos that the following channels published since they were last seen."""
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from . import __about__ as about
+from .cache import read_json
+from .cache import write_json
+from .cache import xdg_cache_home
+from .live_status import GQL_URL
+from .live_status import post_gql
+from .media import from_info
+from .media import Media
+
+MARKERS_FILE = Path.joinpath(xdg_cache_home, about.APP_NAME, "seen_videos.json")
+
+# Most channels have a few new videos, so the first page is small.
+FIRST_PAGE_SIZE = 10
+PAGE_SIZE = 100
+# A channel that wasn't seen for a long time shows only its newest videos.
+MAX_NEW_VIDEOS = 100
+
+VIDEOS_QUERY = """
+query FilterableVideoTower_Videos(
+  $channelOwnerLogin: String!, $limit: Int, $cursor: Cursor,
+  $broadcastType: BroadcastType, $videoSort: VideoSort
+) {
+  user(login: $channelOwnerLogin) {
+    videos(first: $limit, after: $cursor, type: $broadcastType, sort: $videoSort) {
+      edges {
+        cursor
+        node {
+          id
+          title
+          lengthSeconds
+          viewCount
+          publishedAt
+          previewThumbnailURL
+        }
+      }
+    }
+  }
+}
+"""
+
+
+def read_markers(path: Path = MARKERS_FILE) -> Dict[str, list]:
+    """Return the [video ID, timestamp] of the newest seen video of every channel."""
+    return read_json(path) or {}
+
+
+def write_markers(
+    new_videos: Dict[str, List[Media]], path: Path = MARKERS_FILE
+) -> None:
+    """Mark the newest video of every login as seen."""
+    markers = read_markers(path)
+
+    for login, videos in new_videos.items():
+        if videos:
+            markers[login] = [videos[0].media_id.lstrip("v"), videos[0].timestamp or 0]
+
+    write_json(path, markers)
+
+
+def parse_timestamp(text: Optional[str]) -> Optional[float]:
+    """Return the timestamp of a time in the Twitch API format."""
+    if not text:
+        return None
+    return (
+        datetime.strptime(text, "%Y-%m-%dT%H:%M:%SZ")
+        .replace(tzinfo=timezone.utc)
+        .timestamp()
+    )
+
+
+def media_from_node(node: dict, uploader: Optional[str] = None) -> Media:
+    """Return a flat media from a GQL video node, without its formats."""
+    return from_info(
+        {
+            "id": f"v{node['id']}",
+            "url": f"https://www.twitch.tv/videos/{node['id']}",
+            "title": node.get("title"),
+            "timestamp": parse_timestamp(node.get("publishedAt")),
+            "duration": node.get("lengthSeconds"),
+            "view_count": node.get("viewCount"),
+            "uploader": uploader,
+            "thumbnail": node.get("previewThumbnailURL"),
+        }
+    )
+
+
+def fetch_videos_pages(
+    cursors: Dict[str, Optional[str]],
+    limits: Dict[str, int],
+    url: str = GQL_URL,
+    timeout: Optional[float] = None,
+    video_sort: str = "TIME",
+    broadcast_type: Optional[str] = None,
+) -> Dict[str, list]:
+    """Return a page of video edges for every login, with few HTTP requests.
+
+    The broadcast type filters the videos, and all of them are returned without it.
+    """
+    logins = tuple(cursors)
+    operations = [
+        {
+            "operationName": "FilterableVideoTower_Videos",
+            "query": VIDEOS_QUERY,
+            "variables": {
+                "channelOwnerLogin": login,
+                "limit": limits[login],
+                "cursor": cursors[login],
+                "broadcastType": broadcast_type,
+                "videoSort": video_sort,
+            },
+        }
+        for login in logins
+    ]
+
+    edges: Dict[str, list] = {}
+    for login, result in zip(logins, post_gql(operations, url, timeout)):
+        user = (result.get("data") or {}).get("user") or {}
+        edges[login] = (user.get("videos") or {}).get("edges") or []
+
+    return edges
+
+
+def fetch_new_videos(
+    markers: Dict[str, Optional[list]],
+    url: str = GQL_URL,
+    timeout: Optional[float] = None,
+    unseen_count: int = 5,
+) -> Dict[str, List[Media]]:
+    """Return every login's videos that are newer than its marker, the newest first.
+
+    The pages are fetched until the marker is reached, so the cost grows with the
+    new videos and not with the channels' catalogues. A login without a marker gets
+    its newest unseen_count videos.
+    """
+    new_videos: Dict[str, List[Media]] = {login: [] for login in markers}
+    cursors: Dict[str, Optional[str]] = dict.fromkeys(markers)
+
+    while cursors:
+        limits = {}
+        for login, cursor in cursors.items():
+            if not markers[login]:
+                limits[login] = min(unseen_count, PAGE_SIZE)
+            elif cursor is None:
+                limits[login] = FIRST_PAGE_SIZE
+            else:
+                limits[login] = PAGE_SIZE
+        pages = fetch_videos_pages(cursors, limits, url, timeout)
+
+        next_cursors: Dict[str, Optional[str]] = {}
+        for login, edges in pages.items():
+            marker = markers[login]
+            reached = False
+            for edge in edges:
+                node = edge.get("node") or {}
+                if not node.get("id"):
+                    continue
+                video = media_from_node(node, login)
+                # The marked video might be deleted, so its time is compared too.
+                if marker and (
+                    node.get("id") == marker[0] or (video.timestamp or 0) <= marker[1]
+                ):
+                    reached = True
+                    break
+
+                new_videos[login].append(video)
+
+            if (
+                marker
+                and not reached
+                and len(edges) == limits[login]
+                and edges[-1].get("cursor")
+                and len(new_videos[login]) < MAX_NEW_VIDEOS
+            ):
+                next_cursors[login] = edges[-1]["cursor"]
+        cursors = next_cursors
+
+    return new_videos
+
+
+def check_new_videos(
+    channels: tuple,
+    url: str = GQL_URL,
+    timeout: Optional[float] = None,
+    unseen_count: int = 5,
+    path: Path = MARKERS_FILE,
+    mark_seen: bool = True,
+) -> List[Media]:
+    """Return the new videos of all the channels in one list, the newest first.
+
+    The videos are numbered, they have their channel's name as their uploader, and
+    they are marked as seen unless mark_seen is false.
+    """
+    names = {channel["id"].lower(): channel["name"] for channel in channels}
+    markers = read_markers(path)
+
+    channels_videos = fetch_new_videos(
+        {login: markers.get(login) for login in names}, url, timeout, unseen_count
+    )
+    if mark_seen:
+        write_markers(channels_videos, path)
+
+    videos_list = sorted(
+        (
+            video._replace(uploader=names[login])
+            for login, videos in channels_videos.items()
+            for video in videos
+        ),
+        key=lambda video: video.timestamp or 0,
+        reverse=True,
+    )
+    return [
+        video._replace(playlist_index=index)
+        for index, video in enumerate(videos_list, start=1)
+    ]
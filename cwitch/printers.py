@@ -1,61 +1,221 @@
 """Data printers."""
+import shutil
+import sys
 from argparse import Namespace
+from typing import List
+from typing import Sequence
+from typing import Tuple
 
 from prompt_toolkit import HTML
 from prompt_toolkit import print_formatted_text
+from prompt_toolkit.formatted_text import AnyFormattedText
+from prompt_toolkit.formatted_text import FormattedText
+from prompt_toolkit.formatted_text import to_formatted_text
+from prompt_toolkit.utils import get_cwidth
 
+from .media import Media
 
-def print_media_data(args: Namespace, media: dict) -> None:
+# The cells between the columns of a table.
+COLUMNS_GAP = "  "
+# A title is never cut shorter than it.
+MIN_TITLE_WIDTH = 20
+
+
+def print_media_data(args: Namespace, media: Media) -> None:
     """Print media data in a readable way."""
     from datetime import datetime, timedelta
 
     print_formatted_text(
-        HTML(f"---- <aqua>{media['webpage_url_basename']}</aqua> ----"), end=""
+        HTML(f"---- <aqua>{media.webpage_url_basename}</aqua> ----"), end=""
     )
-    if media["playlist_index"]:
-        print_formatted_text(HTML(f"<lime>[{media['playlist_index']}]</lime>"))
+    if media.playlist_index:
+        print_formatted_text(HTML(f"<lime>[{media.playlist_index}]</lime>"))
     else:
         print()
-    print_formatted_text(HTML("<b>Title:</b>"), media["title"])
-    print_formatted_text(
-        HTML("<b>Date:</b>"), datetime.fromtimestamp(int(media["timestamp"]))
-    )
-    try:
+    print_formatted_text(HTML("<b>Title:</b>"), media.title)
+    if media.timestamp:
+        # Flat entries of a videos list don't have a date.
         print_formatted_text(
-            HTML("<b>Duration:</b>"), timedelta(seconds=media["duration"])
+            HTML("<b>Date:</b>"), datetime.fromtimestamp(int(media.timestamp))
         )
-    except KeyError:
+    if media.duration:
         # If it was a live stream there will be no duration
-        pass
-    if media["view_count"]:
-        print_formatted_text(HTML("<b>View count:</b>"), media["view_count"])
-    if args.verbosity:
         print_formatted_text(
-            HTML("<orange>#</orange><b>Uploader:</b>"), media["uploader"]
+            HTML("<b>Duration:</b>"), timedelta(seconds=media.duration)
         )
+    if media.view_count:
+        print_formatted_text(HTML("<b>View count:</b>"), media.view_count)
+    if args.verbosity:
+        print_formatted_text(HTML("<orange>#</orange><b>Uploader:</b>"), media.uploader)
         print_formatted_text(
-            HTML("<orange>#</orange><b>Webpage URL:</b>"), media["webpage_url"]
+            HTML("<orange>#</orange><b>Webpage URL:</b>"), media.webpage_url
         )
         print_formatted_text(
-            HTML("<orange>#</orange><b>Thumbnails URLs:</b>"),
-            media["thumbnail"],
-            media["thumbnails"],
+            HTML("<orange>#</orange><b>Thumbnail URL:</b>"), media.thumbnail
         )
+        selected_format = media.selected_format
+        if selected_format is None:
+            # The rest is only available after extracting the formats.
+            return
         print_formatted_text(
             HTML("<orange>#</orange><b>Stream URLs:</b>"),
-            [(x["format_id"], x["url"]) for x in media["formats"]],
+            [(x.format_id, x.url) for x in media.formats],
         )
-        try:
+        if media.subtitles:
             print_formatted_text(
-                HTML("<orange>#</orange><b>Subtitles:</b>"), media["subtitles"]
+                HTML("<orange>#</orange><b>Subtitles:</b>"), media.subtitles
             )
-        except KeyError:
-            pass
-        print_formatted_text(HTML("<orange>#</orange><b>URL:</b>"), media["url"])
-        print_formatted_text(HTML("<orange>#</orange><b>FPS:</b>"), media["fps"])
+        print_formatted_text(HTML("<orange>#</orange><b>URL:</b>"), selected_format.url)
+        print_formatted_text(HTML("<orange>#</orange><b>FPS:</b>"), selected_format.fps)
         print_formatted_text(
             HTML("<orange>#</orange><b>width and height:</b>"),
-            media["width"],
-            media["height"],
+            selected_format.width,
+            selected_format.height,
         )
-        print_formatted_text(HTML("<orange>#</orange><b>Format:</b>"), media["format"])
+        print_formatted_text(
+            HTML("<orange>#</orange><b>Format:</b>"), selected_format.format_id
+        )
+
+
+def fit_width(text: str, width: int) -> str:
+    """Cut a text to a number of terminal cells, and pad it to fill them."""
+    if get_cwidth(text) > width:
+        cut_width = 0
+        for end, character in enumerate(text):
+            cut_width += get_cwidth(character)
+            if cut_width > width - 1:
+                text = text[:end] + "…"
+                break
+    return text + " " * max(0, width - get_cwidth(text))
+
+
+def page_text(text: FormattedText) -> bool:
+    """Show a formatted text in the user's pager, and return whether it's shown."""
+    import io
+    import os
+    import subprocess
+
+    from prompt_toolkit.data_structures import Size
+    from prompt_toolkit.output.vt100 import Vt100_Output
+
+    terminal_size = shutil.get_terminal_size()
+    buffer = io.StringIO()
+    print_formatted_text(
+        text,
+        output=Vt100_Output(
+            buffer,
+            lambda: Size(rows=terminal_size.lines, columns=terminal_size.columns),
+        ),
+    )
+
+    # Like git, keep the colors and the text on the screen, and quit at once when
+    # it fits in one screen.
+    environment = dict(os.environ)
+    environment.setdefault("LESS", "FRX")
+    try:
+        process = subprocess.run(
+            os.environ.get("PAGER") or "less",
+            shell=True,
+            # The terminal output ends the lines with "\r\n".
+            input=buffer.getvalue().replace("\r\n", "\n"),
+            text=True,
+            env=environment,
+        )
+    except OSError:
+        return False
+
+    # The shell couldn't find the pager.
+    return process.returncode != 127
+
+
+def print_lines(lines: Sequence[AnyFormattedText]) -> None:
+    """Print lines with one write, through a pager when they don't fit in the terminal."""
+    text = FormattedText(
+        fragment
+        for i, line in enumerate(lines)
+        for fragment in ([("", "\n")] if i else []) + to_formatted_text(line)
+    )
+
+    # Keep a line for the prompt that comes after them.
+    if (
+        sys.stdout.isatty()
+        and len(lines) >= shutil.get_terminal_size().lines - 1
+        and page_text(text)
+    ):
+        return
+    print_formatted_text(text)
+
+
+def print_media_table(medias: Sequence[Media]) -> None:
+    """Print the medias as a table with a row for each, in one write.
+
+    The columns that no media has a value for are left out.
+    """
+    from datetime import datetime, timedelta
+
+    rows = [
+        (
+            f"[{media.playlist_index or '-'}]",
+            media.title,
+            datetime.fromtimestamp(int(media.timestamp)).strftime("%Y-%m-%d")
+            if media.timestamp
+            else "",
+            str(timedelta(seconds=int(media.duration))) if media.duration else "",
+            f"{media.view_count:,}" if media.view_count else "",
+            media.uploader or "",
+        )
+        for media in medias
+    ]
+    # The header, style and alignment of every column.
+    columns: List[Tuple[str, str, str]] = [
+        ("#", "class:lime", "<"),
+        ("Title", "", "<"),
+        ("Date", "class:gray", "<"),
+        ("Duration", "", ">"),
+        ("Views", "", ">"),
+        ("Channel", "class:aqua", "<"),
+    ]
+
+    shown_columns = [
+        i for i in range(len(columns)) if i == 1 or any(row[i] for row in rows)
+    ]
+    widths = [
+        max([get_cwidth(columns[i][0])] + [get_cwidth(row[i]) for row in rows])
+        for i in range(len(columns))
+    ]
+    # The title takes the rest of the terminal's width.
+    widths[1] = min(
+        widths[1],
+        max(
+            MIN_TITLE_WIDTH,
+            shutil.get_terminal_size().columns
+            - sum(widths[i] + len(COLUMNS_GAP) for i in shown_columns if i != 1),
+        ),
+    )
+
+    def format_cell(text: str, i: int) -> str:
+        if columns[i][2] == ">":
+            return " " * max(0, widths[i] - get_cwidth(text)) + text
+        return fit_width(text, widths[i])
+
+    lines = [
+        FormattedText(
+            [
+                (
+                    "class:b",
+                    COLUMNS_GAP.join(
+                        format_cell(columns[i][0], i) for i in shown_columns
+                    ),
+                )
+            ]
+        )
+    ]
+    for row in rows:
+        line: List[Tuple[str, str]] = []
+        for i in shown_columns:
+            if line:
+                line.append(("", COLUMNS_GAP))
+            line.append((columns[i][1], format_cell(row[i], i)))
+        lines.append(FormattedText(line))
+
+    print_lines(lines)
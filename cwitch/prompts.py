@@ -27,9 +27,12 @@ def formats_prompt(media_formats: list) -> int:
 
 
 def pick_videos_prompt(
-    video_titles: dict,
+    video_titles: dict, allow_extra: bool = True
 ) -> tuple[tuple[int, ...], bool, Optional[int]]:
-    """Prompt to pick a video from a videos list."""
+    """Prompt to pick a video from a videos list.
+
+    Asking for extra videos with 'x' is allowed only when there are extra videos.
+    """
     results = prompt(
         HTML(
             "<b>Pick videos to watch:</b> "
@@ -38,8 +41,10 @@ def pick_videos_prompt(
             + "</gray>"
             + "\n<green>==></green> "
         ),
-        completer=auto_completion.MediaTitlesCompleter(video_titles),
-        validator=input_validation.NumbersListValidator(video_titles.keys()),
+        completer=auto_completion.MediaTitlesCompleter(video_titles, allow_extra),
+        validator=input_validation.NumbersListValidator(
+            video_titles.keys(), allow_extra
+        ),
     ).split()
 
     show_extra = False
@@ -0,0 +1,107 @@
+"""Complete the channels IDs in the shell, without importing the heavy dependencies.
+
+The channels list is parsed into an index that is kept until the list is modified,
+so a completion only reads two small JSON files.
+"""
+import time
+from pathlib import Path
+from typing import List
+from typing import Optional
+
+from . import __about__ as about
+from .cache import read_json
+from .cache import write_json
+from .cache import xdg_cache_home
+from .config import CHANNELS_FILE
+from .config import get_following_channels
+
+INDEX_FILE = Path.joinpath(xdg_cache_home, about.APP_NAME, "channels_index.json")
+RECENT_CHANNELS_FILE = Path.joinpath(
+    xdg_cache_home, about.APP_NAME, "recent_channels.json"
+)
+
+MAX_RECENT_CHANNELS = 50
+
+
+def read_json_list(path: Path, key: str) -> Optional[list]:
+    """Return a list from a JSON file's object, or None when it can't be read."""
+    data = read_json(path)
+    if data is None or not isinstance(data.get(key), list):
+        return None
+    return data[key]
+
+
+def get_channels_index(
+    channels_path: Path = CHANNELS_FILE, index_file: Path = INDEX_FILE
+) -> List[list]:
+    """Return the [name, ID] of every channel in the list.
+
+    The list is parsed again only when its modification time or size changed.
+    """
+    try:
+        stat = channels_path.stat()
+        signature = [str(channels_path), stat.st_mtime_ns, stat.st_size]
+    except OSError:
+        return []
+
+    index = read_json(index_file)
+    if index and index.get("signature") == signature:
+        channels = index.get("channels")
+        if isinstance(channels, list):
+            return channels
+
+    with open(channels_path, "r") as channels_file:
+        channels = [
+            [channel["name"], channel["id"]]
+            for channel in get_following_channels(channels_file)
+        ]
+    write_json(index_file, {"signature": signature, "channels": channels})
+
+    return channels
+
+
+def add_recent_channels(
+    channels_ids: List[str], recent_channels_file: Path = RECENT_CHANNELS_FILE
+) -> None:
+    """Put the watched channels first in the recently watched channels."""
+    recent_channels = read_json_list(recent_channels_file, "channels") or []
+    lowered_ids = {channel_id.lower() for channel_id in channels_ids}
+
+    recent_channels = list(channels_ids) + [
+        channel_id
+        for channel_id in recent_channels
+        if isinstance(channel_id, str) and channel_id.lower() not in lowered_ids
+    ]
+    write_json(
+        recent_channels_file,
+        {"updated": time.time(), "channels": recent_channels[:MAX_RECENT_CHANNELS]},
+    )
+
+
+def complete_channel_id(
+    prefix: str,
+    channels_path: Path = CHANNELS_FILE,
+    index_file: Path = INDEX_FILE,
+    recent_channels_file: Path = RECENT_CHANNELS_FILE,
+) -> List[str]:
+    """Return the channels IDs that start with a prefix, or whose names start with it.
+
+    The recently watched channels come first.
+    """
+    prefix = prefix.lower()
+    recent_channels = read_json_list(recent_channels_file, "channels") or []
+
+    completions = []
+    seen_ids = set()
+    for name, channel_id in [
+        [channel_id, channel_id]
+        for channel_id in recent_channels
+        if isinstance(channel_id, str)
+    ] + get_channels_index(channels_path, index_file):
+        if channel_id.lower() in seen_ids:
+            continue
+        if channel_id.lower().startswith(prefix) or name.lower().startswith(prefix):
+            completions.append(channel_id)
+            seen_ids.add(channel_id.lower())
+
+    return completions
@@ -1,130 +1,501 @@
 """CLI subcommands functions."""
-import threading
+import asyncio
+import time
 from argparse import Namespace
-from typing import Generator
+from concurrent.futures import as_completed
+from concurrent.futures import Future
+from functools import partial
+from typing import Callable
+from typing import Dict
+from typing import List
 from typing import Optional
 from typing import Tuple
+from typing import TYPE_CHECKING
 
 from prompt_toolkit import HTML
 from prompt_toolkit import print_formatted_text
 from prompt_toolkit.shortcuts import ProgressBar
 from prompt_toolkit.shortcuts.progress_bar import formatters
+from prompt_toolkit.shortcuts.progress_bar import ProgressBarCounter
 
-from . import extractors
+from . import cache
 from . import printers
 from . import prompts
+from . import timings
 from .config import get_config
 from .config import get_following_channels
+from .config import get_max_workers
+from .engine import Engine
 
+if TYPE_CHECKING:
+    # yt-dlp is imported only when something is extracted with it.
+    from . import extractors
 
-def infinity() -> Generator:
-    """Infinity function to be used in progress bars."""
-    while True:
-        yield None
 
+def wait_with_progress(futures: List[Future], title: str) -> None:
+    """Show a progress bar until all the futures are done.
 
-def channels_command(
-    args: Namespace, playlist_start: int = 0, extra_count: Optional[int] = None
-) -> Tuple[Optional[list], Optional[int], Optional[int]]:
-    """Run the channel subcommand."""
-    if args.stream:
-        stream_data = None
+    The bar is only redrawn by its own refresh timer, and the waiting doesn't poll.
+    """
+    with ProgressBar(
+        title=HTML(f"<style bg='white' fg='black'>{title}</style>"),
+        formatters=[
+            formatters.Bar(
+                start="[", end="]", unknown="*", sym_a="=", sym_b="=", sym_c="-"
+            ),
+        ],
+    ) as pb:
+        # A single extraction has no steps, so it's shown as an unknown progress.
+        counter: ProgressBarCounter = pb(
+            total=len(futures) if len(futures) > 1 else None
+        )
 
-        def fetch_stream_data(channel_id: str) -> None:
-            nonlocal stream_data
+        for _future in as_completed(futures):
+            counter.item_completed()
+        pb.title = ""
 
-            stream_data = extractors.extract_stream(channel_id, args.verbosity)
 
-            if not stream_data:
-                print_formatted_text(
-                    HTML(f"<red>Error:</red> ({channel_id}) is <b>offline</b>.")
-                )
+def extract_all(
+    engine: Engine, function: Callable, arguments: list, title: str
+) -> list:
+    """Call an extraction function with every arguments tuple in parallel.
 
-        thread = threading.Thread(target=fetch_stream_data, args=(args.channel_id,))
-        thread.daemon = True
-        thread.start()
+    The results are returned in the same order as the arguments.
+    """
+    futures = [engine.submit(function, *a) for a in arguments]
+    wait_with_progress(futures, title)
 
-        with ProgressBar(
-            title=HTML("<style bg='white' fg='black'>Fetching stream data...</style>"),
-            formatters=[
-                formatters.Bar(start="[", end="]", unknown="*", sym_b="-", sym_c="-")
-            ],
-        ) as pb:
-            for _ in pb(infinity()):
-                if not thread.is_alive():
-                    pb.title = ""
-                    break
+    return [future.result() for future in futures]
 
-        if stream_data:
-            return [stream_data], None, None
 
-    elif args.list_videos:
-        config = get_config(args.config_file)
-        videos_data = {}
+def remember_channels(args: Namespace, channels_ids: List[str]) -> None:
+    """Keep the watched channels, so their IDs are completed first in the shell."""
+    from . import shell_completion
+
+    if channels_ids and not args.no_cache:
+        shell_completion.add_recent_channels(channels_ids)
+
+
+def channels_command(
+    args: Namespace,
+    videos_session: Optional["extractors.ChannelVideosSession"] = None,
+    extra_count: Optional[int] = None,
+) -> Tuple[Optional[list], Optional["extractors.ChannelVideosSession"], Optional[int]]:
+    """Run the channel subcommand.
 
-        def fetch_channel_videos_list(channel_id: str) -> None:
-            nonlocal videos_data
+    Continue listing the videos from the given session to show extra videos.
+    """
+    from . import extractors
 
-            videos_data = extractors.extract_channel_videos(
-                channel_id,
-                extra_count
-                or args.max_list_length
-                or config["playlist_fetching"]["max_videos_count"],
-                playlist_start + 1,
-                verbosity=args.verbosity,
+    if args.stream:
+        with Engine(1) as engine:
+            (stream_data,) = extract_all(
+                engine,
+                extractors.extract_stream,
+                [(args.channel_id, args.verbosity)],
+                "Fetching stream data...",
             )
 
-        thread = threading.Thread(
-            target=fetch_channel_videos_list, args=(args.channel_id,)
+        if stream_data:
+            remember_channels(args, [args.channel_id])
+            return [stream_data], None, None
+
+        print_formatted_text(
+            HTML(f"<red>Error:</red> ({args.channel_id}) is <b>offline</b>.")
         )
-        thread.daemon = True
-        thread.start()
 
-        with ProgressBar(
-            title=HTML("<style bg='white' fg='black'>Fetching videos data...</style>"),
-            formatters=[
-                formatters.Bar(start="[", end="]", unknown="*", sym_b="-", sym_c="-")
-            ],
-        ) as pb:
-            for _ in pb(infinity()):
-                if not thread.is_alive():
-                    pb.title = ""
-                    break
-
-        video_titles = {}
-        for video in videos_data["entries"]:
-            video_titles.update({str(video["playlist_index"]): video["title"]})
-            printers.print_media_data(args, video)
-
-        videos_to_watch, show_extra, extra_count = prompts.pick_videos_prompt(
-            video_titles
+    elif args.list_videos:
+        config = get_config(args.config_file)
+        videos_session = videos_session or extractors.ChannelVideosSession(
+            args.channel_id,
+            url=config["following_channels"]["gql_url"],
+            timeout=config["extraction"]["timeout"],
         )
 
-        unsorted_to_watch_data = {
-            i: d
-            for i, d in enumerate(videos_data["entries"])
-            if i + playlist_start + 1 in videos_to_watch
-        }
+        page_length = (
+            extra_count
+            or args.max_list_length
+            or config["playlist_fetching"]["max_videos_count"]
+        )
 
-        # Sort them according to the selection order.
-        to_watch_data = [
-            unsorted_to_watch_data[i - (1 + playlist_start)] for i in videos_to_watch
-        ]
+        with Engine(get_max_workers(args)) as engine:
+            try:
+                (videos_list,) = extract_all(
+                    engine,
+                    videos_session.next_page,
+                    [(page_length,)],
+                    "Fetching videos data...",
+                )
+            except (OSError, ValueError) as error:
+                print_formatted_text(
+                    HTML("<red>Error:</red> Can't list the videos ({}).").format(
+                        str(error)
+                    )
+                )
+                return None, None, None
+
+            if not videos_list:
+                print_formatted_text(HTML("<red>Error</red>: There is no more videos."))
+                return None, None, None
+
+            video_titles = {
+                str(video.playlist_index): video.title for video in videos_list
+            }
+            with timings.span("videos list", "rendering"):
+                if args.verbosity:
+                    for video in videos_list:
+                        printers.print_media_data(args, video)
+                else:
+                    printers.print_media_table(videos_list)
+
+            # Fetch the next page while waiting for the user, to show extra videos at once.
+            prefetch_count = min(
+                page_length, config["playlist_fetching"]["prefetch_count"]
+            )
+            if prefetch_count > 0:
+                engine.submit(videos_session.prefetch, prefetch_count)
 
-        if show_extra:
-            return (
-                to_watch_data,
-                len(videos_data["entries"]) + playlist_start,
-                extra_count,
+            with timings.span("pick videos", "prompt"):
+                videos_to_watch, show_extra, extra_count = prompts.pick_videos_prompt(
+                    video_titles
+                )
+
+            if not show_extra:
+                videos_session.cancel_prefetch()
+
+            # Sort them according to the selection order.
+            videos_by_index = {video.playlist_index: video for video in videos_list}
+            to_watch_entries = [videos_by_index[i] for i in videos_to_watch]
+
+            # The list has only flat entries, so extract the formats of the picked videos.
+            to_watch_data = extract_all(
+                engine,
+                extractors.extract_video,
+                [
+                    (entry.media_id.lstrip("v"), args.verbosity)
+                    for entry in to_watch_entries
+                ],
+                "Fetching videos data...",
             )
+        to_watch_data = [video_data for video_data in to_watch_data if video_data]
+        if to_watch_data:
+            remember_channels(args, [args.channel_id])
+
+        if show_extra:
+            return to_watch_data, videos_session, extra_count
         elif to_watch_data:
             return to_watch_data, None, None
 
     return None, None, None
 
 
-def following_channels_command(args: Namespace) -> Optional[list]:
-    """Run the following channels subcommand."""
+def check_streams_status(
+    args: Namespace,
+    engine: Engine,
+    channels: tuple,
+    gql_url: str,
+    timeout: float,
+    statuses: Dict[str, list],
+    quiet: bool = False,
+) -> Optional[list]:
+    """Check all the channels with one request and return the online ones.
+
+    The status is taken from a running daemon when it tracks the channels, so only
+    the untracked channels are requested. The streams data isn't extracted here, so
+    it is None in the returned list. Every channel's status is added to statuses.
+    """
+    from . import daemon
+    from . import live_status
+
+    config = get_config(args.config_file)
+    status = {
+        login: channel_status
+        for login, channel_status in (
+            daemon.read_state(2 * config["daemon"]["max_interval"]) or {}
+        ).items()
+        if channel_status.get("live") is not None
+    }
+    untracked_logins = [
+        channel["id"] for channel in channels if channel["id"].lower() not in status
+    ]
+
+    if untracked_logins:
+        try:
+            (untracked_status,) = extract_all(
+                engine,
+                live_status.fetch_live_status,
+                [(untracked_logins, gql_url, timeout)],
+                "Checking channels status...",
+            )
+        except (OSError, ValueError) as error:
+            print_formatted_text(
+                HTML(
+                    "<orange>Warning:</orange> Can't check the channels at once ({}), "
+                    + "checking them one by one."
+                ).format(str(error))
+            )
+            return None
+        status.update(untracked_status)
+
+    checked = time.time()
+    online_channels = []
+    lines = []
+    with timings.span("channels status", "rendering"):
+        for channel in channels:
+            stream = status.get(channel["id"].lower())
+            if stream and stream.get("live", True):
+                statuses[channel["id"].lower()] = [
+                    checked,
+                    True,
+                    stream["title"],
+                    stream["viewer_count"],
+                ]
+                online_channels.append((channel, None))
+            else:
+                statuses[channel["id"].lower()] = [checked, False, None, None]
+
+            if quiet:
+                continue
+            elif stream and stream.get("live", True):
+                lines.append(
+                    HTML(
+                        "<lime>[{}]</lime> ({}) is <green><b>online</b></green> "
+                        + "<gray>{}</gray> (<b>{}</b> viewers)"
+                    ).format(
+                        len(online_channels),
+                        channel["name"],
+                        stream["title"] or "",
+                        stream["viewer_count"] or 0,
+                    )
+                )
+            elif not args.online:
+                lines.append(
+                    HTML("<red>[-]</red> ({}) is <red><b>offline</b></red>").format(
+                        channel["name"]
+                    )
+                )
+
+        # The whole board is written at once.
+        if lines:
+            printers.print_lines(lines)
+
+    return online_channels
+
+
+def check_streams_data(
+    args: Namespace,
+    engine: Engine,
+    channels: tuple,
+    timeout: float,
+    statuses: Dict[str, list],
+    quiet: bool = False,
+) -> list:
+    """Extract the streams of all the channels and return the online ones.
+
+    Every channel's status is added to statuses, unless it timed out.
+    """
+    from . import extractors
+
+    online_channels: list = []
+
+    futures = {
+        engine.submit(
+            extractors.extract_stream,
+            channel["id"],
+            args.verbosity,
+            timeout,
+            timeout=timeout,
+        ): channel
+        for channel in channels
+    }
+
+    with ProgressBar(
+        formatters=[
+            formatters.Text("("),
+            formatters.Percentage(),
+            formatters.Text(")"),
+            formatters.Bar(start="[", end="]", sym_a="=", sym_b="=", sym_c="-"),
+        ],
+    ) as pb:
+        counter: ProgressBarCounter = pb(total=len(futures))
+
+        # Report channels in the order they finish.
+        for future in as_completed(futures):
+            channel = futures[future]
+            counter.item_completed()
+            pb.title = HTML(
+                "<style bg='white' fg='black'>"
+                + f"Checking for ({len(futures) - counter.items_completed}) "
+                + "channels...</style>"
+            )
+
+            try:
+                stream_data = future.result()
+            except asyncio.TimeoutError:
+                if quiet:
+                    continue
+                print_formatted_text(
+                    HTML(
+                        f"<orange>[-]</orange> ({channel['name']}) "
+                        + "is <orange><b>timed out</b></orange>"
+                    )
+                )
+                continue
+
+            if stream_data:
+                statuses[channel["id"].lower()] = [
+                    time.time(),
+                    True,
+                    stream_data.description,
+                    stream_data.view_count,
+                ]
+                online_channels.append((channel, stream_data))
+            else:
+                statuses[channel["id"].lower()] = [time.time(), False, None, None]
+
+            if quiet:
+                continue
+            elif stream_data:
+                print_formatted_text(
+                    HTML(
+                        f"<lime>[{len(online_channels)}]</lime> ({channel['name']}) "
+                        + "is <green><b>online</b></green>"
+                    )
+                )
+            elif not args.online:
+                print_formatted_text(
+                    HTML(
+                        f"<red>[-]</red> ({channel['name']}) "
+                        + "is <red><b>offline</b></red>"
+                    )
+                )
+        pb.title = ""
+
+    return online_channels
+
+
+def format_channel_status(
+    index: Optional[int], channel: dict, status: list, changed: bool = False
+) -> HTML:
+    """Return a channel's status from a snapshot, or its change since the snapshot."""
+    _checked, is_live, title, viewers = status
+    now = " now" if changed else ""
+
+    if is_live:
+        return HTML(
+            "<lime>[{}]</lime> ({}) is{} <green><b>online</b></green> "
+            + "<gray>{}</gray> (<b>{}</b> viewers)"
+        ).format(index, channel["name"], now, title or "", viewers or 0)
+    return HTML("<red>[-]</red> ({}) is{} <red><b>offline</b></red>").format(
+        channel["name"], now
+    )
+
+
+def print_status_snapshot(
+    args: Namespace, channels: tuple, snapshot: Dict[str, list]
+) -> list:
+    """Print the last known status of the channels, and return the online ones."""
+    known_channels = [c for c in channels if c["id"].lower() in snapshot]
+    if not known_channels:
+        return []
+
+    oldest_check = min(snapshot[c["id"].lower()][0] for c in known_channels)
+    print_formatted_text(
+        HTML("<gray>Status from {} minutes ago, refreshing it...</gray>").format(
+            int((time.time() - oldest_check) // 60)
+        )
+    )
+
+    online_channels = []
+    lines = []
+    for channel in known_channels:
+        status = snapshot[channel["id"].lower()]
+        if status[1]:
+            online_channels.append(channel)
+            lines.append(format_channel_status(len(online_channels), channel, status))
+        elif not args.online:
+            lines.append(format_channel_status(None, channel, status))
+
+    if lines:
+        printers.print_lines(lines)
+    return online_channels
+
+
+def print_status_changes(
+    args: Namespace,
+    channels: tuple,
+    snapshot: Dict[str, list],
+    statuses: Dict[str, list],
+    snapshot_online_channels: list,
+    online_channels: list,
+) -> list:
+    """Print only the channels whose status changed since the snapshot.
+
+    Return the channels to pick from, keeping the numbers that were already shown for
+    the snapshot's online channels, and adding the new online channels after them.
+    """
+    streams_data = {channel["id"]: data for channel, data in online_channels}
+    to_pick = [
+        (channel, streams_data.get(channel["id"]))
+        for channel in snapshot_online_channels
+    ]
+
+    changes_count = 0
+    lines = []
+    for channel in channels:
+        status = statuses.get(channel["id"].lower())
+        if status is None:
+            # Timed out.
+            continue
+
+        # A channel that isn't in the snapshot has no change to show, only its status.
+        is_known = channel["id"].lower() in snapshot
+        was_live = snapshot[channel["id"].lower()][1] if is_known else None
+        if is_known and status[1] == was_live:
+            continue
+
+        if status[1]:
+            to_pick.append((channel, streams_data[channel["id"]]))
+            lines.append(
+                format_channel_status(len(to_pick), channel, status, changed=is_known)
+            )
+        elif was_live or not args.online:
+            lines.append(format_channel_status(None, channel, status, changed=is_known))
+        if is_known:
+            changes_count += 1
+
+    if not changes_count:
+        print_formatted_text(HTML("<gray>Nothing changed.</gray>"))
+    if lines:
+        printers.print_lines(lines)
+
+    return to_pick
+
+
+def fetch_streams_data(
+    args: Namespace, engine: Engine, channels: list, timeout: float
+) -> list:
+    """Extract the streams of the picked channels, in the same order."""
+    from . import extractors
+
+    streams_data = extract_all(
+        engine,
+        extractors.extract_stream,
+        [(channel["id"], args.verbosity, timeout) for channel in channels],
+        "Fetching streams data...",
+    )
+
+    for channel, stream_data in zip(channels, streams_data):
+        if not stream_data:
+            print_formatted_text(
+                HTML(f"<red>Error:</red> ({channel['name']}) is <b>offline</b>.")
+            )
+
+    return streams_data
+
+
+def get_channels_or_error(args: Namespace) -> tuple:
+    """Return the following channels, and print an error if there is none."""
     channels = get_following_channels(args.channels_file)
 
     if not channels:
@@ -136,93 +507,227 @@ def following_channels_command(args: Namespace) -> Optional[list]:
                 ),
             )
         )
-        return None
+    return channels
 
-    streams_data: list = []
-    streams_titles = {}
 
-    def fetch_stream_data(channel: dict) -> None:
-        nonlocal streams_data, streams_titles
+def following_channels_command(args: Namespace) -> Optional[list]:
+    """Run the following channels subcommand."""
+    channels = get_channels_or_error(args)
+    if not channels:
+        return None
 
-        stream_data = extractors.extract_stream(channel["id"], args.verbosity)
-        if stream_data:
-            print_formatted_text(
-                HTML(
-                    f"<lime>[{len(streams_data) + 1}]</lime> ({channel['name']}) "
-                    + "is <green><b>online</b></green>"
-                )
+    config = get_config(args.config_file)
+    timeout = args.timeout or config["extraction"]["timeout"]
+
+    # Show the last known status at once, then show only what the refresh changed.
+    snapshot = {}
+    if args.cached and not args.no_cache:
+        snapshot = cache.read_status_snapshot()
+    with timings.span("status snapshot", "rendering"):
+        snapshot_online_channels = print_status_snapshot(args, channels, snapshot)
+    quiet = any(c["id"].lower() in snapshot for c in channels)
+
+    # Bound the number of concurrent extractions, so a long channels list
+    # doesn't flood Twitch with requests or fill the memory.
+    with Engine(get_max_workers(args)) as engine:
+        statuses: Dict[str, list] = {}
+        online_channels = None
+        if config["following_channels"]["status_backend"] == "gql":
+            online_channels = check_streams_status(
+                args,
+                engine,
+                channels,
+                config["following_channels"]["gql_url"],
+                timeout,
+                statuses,
+                quiet,
             )
-            streams_data.append(stream_data)
-            streams_titles.update({str(len(streams_data)): channel["name"]})
-        elif not args.online:
-            print_formatted_text(
-                HTML(f"<red>[-]</red> ({channel['name']}) is <red><b>offline</b></red>")
+        if online_channels is None:
+            online_channels = check_streams_data(
+                args, engine, channels, timeout, statuses, quiet
             )
 
-    threads = {}
-    for channel in channels:
-        threads.update(
-            {channel["id"]: threading.Thread(target=fetch_stream_data, args=(channel,))}
-        )
-        threads[channel["id"]].daemon = True
-        threads[channel["id"]].start()
+        if not args.no_cache:
+            cache.write_status_snapshot(statuses)
+
+        if quiet:
+            with timings.span("status changes", "rendering"):
+                online_channels = print_status_changes(
+                    args,
+                    channels,
+                    snapshot,
+                    statuses,
+                    snapshot_online_channels,
+                    online_channels,
+                )
 
-    with ProgressBar(
-        formatters=[
-            formatters.Text("("),
-            formatters.Percentage(),
-            formatters.Text(")"),
-            formatters.Bar(start="[", end="]", sym_a="=", sym_b="=", sym_c="-"),
-        ],
-    ) as pb:
-        for channel_id, thread in pb(threads.items()):
-            pb.title = HTML(
-                f"<style bg='white' fg='black'>Checking for ({channel_id})...</style>"
+        if not online_channels:
+            return None
+
+        with timings.span("pick streams", "prompt"):
+            to_watch = prompts.pick_streams_prompt(
+                {
+                    str(i): channel["name"]
+                    for i, (channel, _) in enumerate(online_channels, start=1)
+                }
             )
-            thread.join()
-        pb.title = ""
 
-    if streams_data:
-        to_watch = prompts.pick_streams_prompt(streams_titles)
+        # Sort them according to the selection order.
+        to_watch_channels = [online_channels[i - 1] for i in to_watch]
+        remember_channels(args, [channel["id"] for channel, _ in to_watch_channels])
+
+        # Only the picked streams need a full extraction.
+        missing_channels = [
+            c for c, stream_data in to_watch_channels if not stream_data
+        ]
+        fetched_data = dict(
+            zip(
+                (channel["id"] for channel in missing_channels),
+                fetch_streams_data(args, engine, missing_channels, timeout)
+                if missing_channels
+                else (),
+            )
+        )
+
+    to_watch_data = [
+        stream_data or fetched_data[channel["id"]]
+        for channel, stream_data in to_watch_channels
+    ]
+    to_watch_data = [stream_data for stream_data in to_watch_data if stream_data]
+
+    if to_watch_data:
+        return to_watch_data
+    return None
+
+
+def daemon_command(args: Namespace) -> int:
+    """Run the daemon subcommand until it's interrupted."""
+    from . import daemon
+
+    channels = get_channels_or_error(args)
+    if not channels:
+        return 1
+
+    config = get_config(args.config_file)
+
+    if daemon.read_state(2 * config["daemon"]["max_interval"]) is not None:
+        print_formatted_text(HTML("<red>Error:</red> The daemon is already running."))
+        return 1
+
+    print_formatted_text(
+        HTML("Tracking ({}) channels in <b>{}</b>").format(
+            len(channels), str(daemon.STATE_FILE)
+        )
+    )
+    daemon.run_daemon(
+        channels,
+        config["following_channels"]["gql_url"],
+        config["daemon"]["min_interval"],
+        config["daemon"]["max_interval"],
+        args.timeout or config["extraction"]["timeout"],
+    )
+    return 0
+
+
+def new_videos_command(args: Namespace) -> Optional[list]:
+    """Run the new videos subcommand."""
+    from . import extractors
+    from . import new_videos
+
+    channels = get_channels_or_error(args)
+    if not channels:
+        return None
 
-        unsorted_to_watch_data = {
-            i: d for i, d in enumerate(streams_data) if i + 1 in to_watch
-        }
+    config = get_config(args.config_file)
+
+    with Engine(get_max_workers(args)) as engine:
+        try:
+            (videos_list,) = extract_all(
+                engine,
+                new_videos.check_new_videos,
+                [
+                    (
+                        channels,
+                        config["following_channels"]["gql_url"],
+                        args.timeout or config["extraction"]["timeout"],
+                        config["playlist_fetching"]["max_videos_count"],
+                    )
+                ],
+                "Checking for new videos...",
+            )
+        except (OSError, ValueError) as error:
+            print_formatted_text(
+                HTML("<red>Error:</red> Can't check for new videos ({}).").format(
+                    str(error)
+                )
+            )
+            return None
+
+        if not videos_list:
+            print_formatted_text(HTML("<gray>There is no new videos.</gray>"))
+            return None
+
+        with timings.span("new videos list", "rendering"):
+            if args.verbosity:
+                for video in videos_list:
+                    printers.print_media_data(args, video)
+            else:
+                printers.print_media_table(videos_list)
+
+        with timings.span("pick videos", "prompt"):
+            # All the new videos are already listed, so there are no extra videos.
+            videos_to_watch, _show_extra, _extra_count = prompts.pick_videos_prompt(
+                {str(video.playlist_index): video.title for video in videos_list},
+                allow_extra=False,
+            )
 
         # Sort them according to the selection order.
-        to_watch_data = [unsorted_to_watch_data[i - 1] for i in to_watch]
+        to_watch_entries = [videos_list[i - 1] for i in videos_to_watch]
+
+        to_watch_data = extract_all(
+            engine,
+            extractors.extract_video,
+            [
+                (entry.media_id.lstrip("v"), args.verbosity)
+                for entry in to_watch_entries
+            ],
+            "Fetching videos data...",
+        )
+    to_watch_data = [video_data for video_data in to_watch_data if video_data]
 
-        if to_watch_data:
-            return to_watch_data
+    if to_watch_data:
+        return to_watch_data
     return None
 
 
 def videos_command(args: Namespace) -> Optional[list]:
     """Run the videos subcommand."""
-    videos_data = []
+    from . import extractors
+
+    if args.quality and len(args.videos_ids) > 1:
+        # There is no formats prompt, so only the first video is needed to start
+        # playing, and the rest are extracted when the player gets close to them.
+        with Engine(1) as engine:
+            (first_video_data,) = extract_all(
+                engine,
+                extractors.extract_video,
+                [(args.videos_ids[0], args.verbosity)],
+                "Fetching videos data...",
+            )
 
-    def fetch_video_data(video_id: str) -> None:
-        nonlocal videos_data
-        videos_data.append(extractors.extract_video(video_id, args.verbosity))
+        return [first_video_data] + [
+            partial(extractors.extract_video, video_id, args.verbosity)
+            for video_id in args.videos_ids[1:]
+        ]
 
-    threads = {}
-    for video_id in args.videos_ids:
-        threads.update(
-            {video_id: threading.Thread(target=fetch_video_data, args=(video_id,))}
+    # Every worker reuses the same YoutubeDL object for its videos.
+    with Engine(get_max_workers(args)) as engine:
+        videos_data = extract_all(
+            engine,
+            extractors.extract_video,
+            [(video_id, args.verbosity) for video_id in args.videos_ids],
+            "Fetching videos data...",
         )
-        threads[video_id].daemon = True
-        threads[video_id].start()
-
-    with ProgressBar(
-        title=HTML("<style bg='white' fg='black'>Fetching videos data...</style>"),
-        formatters=[
-            formatters.Bar(start="[", end="]", sym_a="=", sym_b="=", sym_c="-"),
-        ],
-    ) as pb:
-        for _video_id, thread in pb(threads.items()):
-            if thread.is_alive():
-                thread.join()
-            pb.title = ""
 
     if all((not x for x in videos_data)):
         # When all videos doesn't exist.
@@ -0,0 +1,119 @@
+"""Record how long every phase and extraction takes."""
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import TextIO
+
+
+class Span(NamedTuple):
+    """A named period of time in a thread."""
+
+    name: str
+    category: str
+    start: float
+    end: float
+    thread_id: int
+
+
+class Timings(object):
+    """Collect spans from all the threads, and report them as a table or a trace."""
+
+    def __init__(self) -> None:
+        """Start counting from now."""
+        self.start_time = time.perf_counter()
+        self.spans: List[Span] = []
+
+    @contextmanager
+    def span(self, name: str, category: str) -> Iterator[None]:
+        """Record the time that the with statement's body takes."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            # Appending to a list is thread safe.
+            self.spans.append(
+                Span(name, category, start, time.perf_counter(), threading.get_ident())
+            )
+
+    def print_summary(
+        self, file: TextIO = sys.stderr, outliers_count: int = 10
+    ) -> None:
+        """Print the total time of every category, and the slowest extractions."""
+        import statistics
+
+        totals: Dict[str, List[float]] = {}
+        for span in self.spans:
+            totals.setdefault(span.category, []).append(span.end - span.start)
+
+        print(
+            f"{'category':<14} {'count':>6} {'total':>9} {'mean':>9} {'max':>9}",
+            file=file,
+        )
+        for category, durations in totals.items():
+            print(
+                f"{category:<14} {len(durations):>6} {sum(durations):8.3f}s "
+                + f"{statistics.mean(durations):8.3f}s {max(durations):8.3f}s",
+                file=file,
+            )
+        print(
+            f"{'wall time':<14} {'':>6} {time.perf_counter() - self.start_time:8.3f}s",
+            file=file,
+        )
+
+        extractions = sorted(
+            (s for s in self.spans if s.category == "extraction"),
+            key=lambda s: s.end - s.start,
+            reverse=True,
+        )
+        if len(extractions) < 2:
+            return
+
+        median = statistics.median(s.end - s.start for s in extractions)
+        print(f"\nSlowest extractions (median {median:.3f}s):", file=file)
+        for span in extractions[:outliers_count]:
+            duration = span.end - span.start
+            print(
+                f"{duration:8.3f}s {duration / max(median, 1e-6):6.1f}x  {span.name}",
+                file=file,
+            )
+
+    def write_trace(self, file: TextIO) -> None:
+        """Write the spans in the Chrome trace event format.
+
+        It can be opened in chrome://tracing or https://ui.perfetto.dev.
+        """
+        events = [
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": (span.start - self.start_time) * 1_000_000,
+                "dur": (span.end - span.start) * 1_000_000,
+                "pid": os.getpid(),
+                "tid": span.thread_id,
+            }
+            for span in self.spans
+        ]
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+
+# It is disabled until the CLI enables it.
+recorder: Optional[Timings] = None
+
+
+@contextmanager
+def span(name: str, category: str) -> Iterator[None]:
+    """Record a span when the timings are enabled."""
+    if recorder is None:
+        yield
+    else:
+        with recorder.span(name, category):
+            yield